@@ -1,8 +1,12 @@
 import streamlit as st
 import numpy as np
-import cv2
 import os
-from PIL import Image
+from image_cache import ImageCache, array_key, DECODED_MAX_BYTES, RESULT_MAX_BYTES
+from image_preview import build_pyramid, encode_png
+from transform_stack import compile_stack, warp_step, filter_step
+from convolution import convolve, gaussian_kernel
+from kernel_bank import KernelBank, resize_kernel
+# cv2 and PIL are imported on the tools page only (see PAGE 2), so Home and Team start fast.
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -41,13 +45,22 @@ translations = {
         "tools_title": "🛠️ Image Processing Tools",
         "upload_label": "Upload an Image",
         "select_op": "Select Transformation",
-        "ops_list": ["Translation", "Scaling", "Rotation", "Shearing", "Reflection", "Blur Filter", "Sharpen Filter"],
+        "ops_list": ["Translation", "Scaling", "Rotation", "Shearing", "Reflection", "Blur Filter", "Sharpen Filter", "Gaussian Blur", "Custom Kernel"],
         "params": "Parameters",
         "orig_img": "Original Image",
         "trans_img": "Transformed Image",
         "warn_upload": "Please upload an image via the sidebar to begin.",
         "matrix_geo": "Geometric Transformation Matrix ($3 \\times 3$):",
         "matrix_ker": "Convolution Kernel Used:",
+        "preview_note": "Preview: {pw} × {ph} px · Export: {w} × {h} px",
+        "export_full": "Download Full Resolution (PNG)",
+        "chain_header": "Transform Chain",
+        "chain_add": "Add step",
+        "chain_undo": "Undo",
+        "chain_clear": "Clear",
+        "chain_live": "Apply the current step after the chain",
+        "chain_passes": "{steps} steps run as {passes} passes (consecutive warps share one resampling).",
+        "chain_compiled": "Compiled passes",
         
         # Parameter Labels
         "p_shift_x": "Shift X (pixels)",
@@ -60,6 +73,16 @@ translations = {
         "p_axis": "Reflection Axis",
         "p_kernel": "Kernel Size (Odd number)",
         "p_strength": "Sharpen Strength",
+        "p_sigma": "Sigma (pixels)",
+        "kernel_bank": "Kernel Bank",
+        "kernel_edit": "Kernel values (editable)",
+        "kernel_normalize": "Normalize (divide by sum)",
+        "kernel_info": "Rank {rank} · Sum {total:.4g} · Strategy: {strategy}",
+        "kernel_name": "Save as (name)",
+        "kernel_save": "Save to bank",
+        "kernel_delete": "Delete from bank",
+        "kernel_saved": "Saved '{name}' to the kernel bank.",
+        "kernel_builtin": "'{name}' is a built-in kernel; choose another name.",
 
         # Team Page
         "team_title": "👥 The Team",
@@ -99,13 +122,22 @@ translations = {
         "tools_title": "🛠️ Alat Pengolah Citra",
         "upload_label": "Unggah Gambar",
         "select_op": "Pilih Transformasi",
-        "ops_list": ["Translasi", "Skala", "Rotasi", "Shearing (Geser)", "Refleksi", "Filter Blur", "Filter Sharpen"],
+        "ops_list": ["Translasi", "Skala", "Rotasi", "Shearing (Geser)", "Refleksi", "Filter Blur", "Filter Sharpen", "Blur Gaussian", "Kernel Kustom"],
         "params": "Parameter",
         "orig_img": "Gambar Asli",
         "trans_img": "Gambar Hasil",
         "warn_upload": "Silakan unggah gambar melalui sidebar untuk memulai.",
         "matrix_geo": "Matriks Transformasi Geometris ($3 \\times 3$):",
         "matrix_ker": "Kernel Konvolusi yang Digunakan:",
+        "preview_note": "Pratinjau: {pw} × {ph} px · Ekspor: {w} × {h} px",
+        "export_full": "Unduh Resolusi Penuh (PNG)",
+        "chain_header": "Rantai Transformasi",
+        "chain_add": "Tambah langkah",
+        "chain_undo": "Batalkan",
+        "chain_clear": "Hapus",
+        "chain_live": "Terapkan langkah saat ini setelah rantai",
+        "chain_passes": "{steps} langkah dijalankan dalam {passes} proses (warp berurutan berbagi satu resampling).",
+        "chain_compiled": "Proses hasil kompilasi",
 
         # Parameter Labels
         "p_shift_x": "Geser X (piksel)",
@@ -118,6 +150,16 @@ translations = {
         "p_axis": "Sumbu Refleksi",
         "p_kernel": "Ukuran Kernel (Ganjil)",
         "p_strength": "Kekuatan Penajaman",
+        "p_sigma": "Sigma (piksel)",
+        "kernel_bank": "Bank Kernel",
+        "kernel_edit": "Nilai kernel (dapat diedit)",
+        "kernel_normalize": "Normalisasi (bagi dengan jumlah)",
+        "kernel_info": "Rank {rank} · Jumlah {total:.4g} · Strategi: {strategy}",
+        "kernel_name": "Simpan sebagai (nama)",
+        "kernel_save": "Simpan ke bank",
+        "kernel_delete": "Hapus dari bank",
+        "kernel_saved": "'{name}' disimpan ke bank kernel.",
+        "kernel_builtin": "'{name}' adalah kernel bawaan; pilih nama lain.",
 
         # Team Page
         "team_title": "👥 Anggota Tim",
@@ -176,8 +218,9 @@ def apply_geometric_transform(image, matrix):
     transformed = cv2.warpPerspective(image, matrix, (cols, rows))
     return transformed
 
-def apply_convolution(image, kernel):
-    return cv2.filter2D(image, -1, kernel)
+def apply_convolution(image, kernel, plan=None):
+    # Same result as cv2.filter2D; box, separable and very large kernels take faster paths
+    return convolve(image, kernel, plan)
 
 # --- Navigation ---
 st.sidebar.markdown("---")
@@ -216,6 +259,9 @@ if page == t["nav_options"][0]:
 # PAGE 2: TOOLS
 # ==========================================
 elif page == t["nav_options"][1]:
+    import cv2
+    from PIL import Image
+
     st.title(t["tools_title"])
     
     st.sidebar.markdown("---")
@@ -224,8 +270,23 @@ elif page == t["nav_options"][1]:
     uploaded_file = st.sidebar.file_uploader(t["upload_label"], type=['jpg', 'png', 'jpeg'])
     
     if uploaded_file is not None:
-        original_image = load_image(uploaded_file)
+        # Decoded uploads and transform results are cached per session, so reruns that
+        # only touch other widgets (or return to an earlier slider value) skip the work
+        if "decoded_cache" not in st.session_state:
+            st.session_state["decoded_cache"] = ImageCache(DECODED_MAX_BYTES)
+            st.session_state["result_cache"] = ImageCache(RESULT_MAX_BYTES)
+        decoded_cache = st.session_state["decoded_cache"]
+        result_cache = st.session_state["result_cache"]
+        if "kernel_bank" not in st.session_state:
+            st.session_state["kernel_bank"] = KernelBank()
+        kernel_bank = st.session_state["kernel_bank"]
+        
+        image_key = decoded_cache.upload_key(uploaded_file)
+        original_image = decoded_cache.get_or_compute(image_key, lambda: load_image(uploaded_file))
         rows, cols = original_image.shape[:2]
+        # Sliders edit a screen-sized pyramid level; full resolution is rendered only on export
+        preview_image = decoded_cache.get_or_compute((image_key, "preview"),
+                                                     lambda: build_pyramid(original_image)[-1])
         
         operation = st.sidebar.selectbox(t["select_op"], t["ops_list"])
         
@@ -233,6 +294,7 @@ elif page == t["nav_options"][1]:
         
         processed_image = None
         matrix_to_show = None
+        current_step = None  # The step being edited (applied after the chain)
         
         # --- Logic for each operation ---
         op_index = t["ops_list"].index(operation)
@@ -241,34 +303,35 @@ elif page == t["nav_options"][1]:
             tx = st.sidebar.slider(t["p_shift_x"], -200, 200, 50)
             ty = st.sidebar.slider(t["p_shift_y"], -200, 200, 50)
             matrix_to_show = get_translation_matrix(tx, ty)
-            processed_image = apply_geometric_transform(original_image, matrix_to_show)
+            current_step = warp_step(matrix_to_show, f"{operation}: tx={tx}, ty={ty}")
             
         elif op_index == 1: # Scaling
             sx = st.sidebar.slider(t["p_scale_x"], 0.1, 3.0, 1.0)
             sy = st.sidebar.slider(t["p_scale_y"], 0.1, 3.0, 1.0)
             matrix_to_show = get_scaling_matrix(sx, sy)
-            processed_image = apply_geometric_transform(original_image, matrix_to_show)
+            current_step = warp_step(matrix_to_show, f"{operation}: sx={sx}, sy={sy}")
             
         elif op_index == 2: # Rotation
             angle = st.sidebar.slider(t["p_angle"], -180, 180, 45)
             matrix_to_show = get_rotation_matrix(angle, cols/2, rows/2)
-            processed_image = apply_geometric_transform(original_image, matrix_to_show)
+            current_step = warp_step(matrix_to_show, f"{operation}: {angle}°")
             
         elif op_index == 3: # Shearing
             shx = st.sidebar.slider(t["p_shear_x"], -1.0, 1.0, 0.2)
             shy = st.sidebar.slider(t["p_shear_y"], -1.0, 1.0, 0.0)
             matrix_to_show = get_shear_matrix(shx, shy)
-            processed_image = apply_geometric_transform(original_image, matrix_to_show)
+            current_step = warp_step(matrix_to_show, f"{operation}: shx={shx}, shy={shy}")
             
         elif op_index == 4: # Reflection
             axis = st.sidebar.radio(t["p_axis"], ["x", "y"])
             matrix_to_show = get_reflection_matrix(axis, cols, rows)
-            processed_image = apply_geometric_transform(original_image, matrix_to_show)
+            current_step = warp_step(matrix_to_show, f"{operation}: {axis}")
             
         elif op_index == 5: # Blur Filter
             k_size = st.sidebar.slider(t["p_kernel"], 3, 25, 5, step=2)
             kernel = np.ones((k_size, k_size), np.float32) / (k_size * k_size)
-            processed_image = apply_convolution(original_image, kernel)
+            # Box blurs keep their physical radius on the smaller preview level
+            current_step = filter_step(kernel, f"{operation}: {k_size}×{k_size}", blur=("box", k_size))
             matrix_to_show = kernel 
             
         elif op_index == 6: # Sharpen Filter
@@ -280,14 +343,85 @@ elif page == t["nav_options"][1]:
                 [base, center, base],
                 [0, base, 0]
             ], dtype=np.float32)
-            processed_image = apply_convolution(original_image, kernel)
+            current_step = filter_step(kernel, f"{operation}: {strength}")
+            matrix_to_show = kernel
+
+        elif op_index == 7: # Gaussian Blur
+            sigma = st.sidebar.slider(t["p_sigma"], 0.5, 20.0, 2.0, step=0.5)
+            kernel = gaussian_kernel(sigma)
+            current_step = filter_step(kernel, f"{operation}: σ={sigma}", blur=("gaussian", sigma))
+            matrix_to_show = kernel
+
+        elif op_index == 8: # Custom Kernel
+            import pandas as pd
+            saved = st.session_state.pop("kernel_saved", None)
+            if saved:
+                # Select the kernel saved on the previous run (set before the widget exists)
+                st.session_state["kernel_choice"] = saved
+            name = st.sidebar.selectbox(t["kernel_bank"], kernel_bank.names(), key="kernel_choice")
+            if saved:
+                st.sidebar.success(t["kernel_saved"].format(name=saved))
+            base = kernel_bank.get(name).kernel
+            size = st.sidebar.slider(t["p_kernel"], 1, 15, base.shape[0], step=2, key=f"kernel_size_{name}")
+            st.sidebar.caption(t["kernel_edit"])
+            edited = st.sidebar.data_editor(pd.DataFrame(resize_kernel(base, size)), key=f"kernel_edit_{name}_{size}")
+            kernel = edited.fillna(0).to_numpy(dtype=np.float32)
+            if st.sidebar.checkbox(t["kernel_normalize"]) and kernel.sum() != 0:
+                kernel = kernel / kernel.sum()
+            # Analysed once per distinct kernel; reruns reuse the stored metadata and plan
+            info = kernel_bank.info(kernel)
+            st.sidebar.caption(t["kernel_info"].format(rank=info.rank, total=info.total, strategy=info.plan.strategy))
+            new_name = st.sidebar.text_input(t["kernel_name"])
+            c_save, c_delete = st.sidebar.columns(2)
+            if c_save.button(t["kernel_save"]) and new_name.strip():
+                if kernel_bank.is_builtin(new_name.strip()):
+                    st.sidebar.error(t["kernel_builtin"].format(name=new_name.strip()))
+                else:
+                    kernel_bank.save(new_name.strip(), kernel)
+                    st.session_state["kernel_saved"] = new_name.strip()
+                    st.rerun()
+            if not kernel_bank.is_builtin(name) and c_delete.button(t["kernel_delete"]):
+                kernel_bank.remove(name)
+                st.rerun()
+            current_step = filter_step(kernel, f"{operation}: {name}")
             matrix_to_show = kernel
 
+        # --- Transform chain (per image) ---
+        if st.session_state.get("transform_chain", (None,))[0] != image_key:
+            st.session_state["transform_chain"] = (image_key, [])
+        chain = st.session_state["transform_chain"][1]
+        
+        st.sidebar.markdown("---")
+        st.sidebar.subheader(t["chain_header"])
+        c_add, c_undo, c_clear = st.sidebar.columns(3)
+        if c_add.button(t["chain_add"]) and current_step is not None: chain.append(current_step)
+        if c_undo.button(t["chain_undo"]) and chain: chain.pop()
+        if c_clear.button(t["chain_clear"]): chain.clear()
+        apply_current = st.sidebar.checkbox(t["chain_live"], value=True) if chain else True
+        steps = chain + ([current_step] if apply_current and current_step is not None else [])
+        
+        def render(image):
+            """Runs the chain on one image level: consecutive warps are one warpPerspective,
+            consecutive fusable kernels one filter2D."""
+            key, result = (image_key, image.shape), image
+            for kind, array in compile_stack(steps, original_image.shape, image.shape):
+                # Each pass is cached under its prefix, so editing the last step reuses earlier passes
+                key = key + ((kind, array_key(array)),)
+                if kind == "warp":
+                    compute = lambda src=result, a=array: apply_geometric_transform(src, a)
+                else:
+                    compute = lambda src=result, a=array: apply_convolution(src, a, kernel_bank.plan_for(a))
+                result = result_cache.get_or_compute(key, compute)
+            return result
+
+        if steps:
+            processed_image = render(preview_image)
+
         # --- Display Area ---
         col1, col2 = st.columns(2)
         with col1:
             st.subheader(t["orig_img"])
-            st.image(original_image, use_column_width=True)
+            st.image(preview_image, use_column_width=True)
         with col2:
             st.subheader(t["trans_img"])
             if processed_image is not None:
@@ -295,6 +429,25 @@ elif page == t["nav_options"][1]:
             else:
                 st.write("Adjust parameters to see the result.")
         
+        if steps:
+            st.caption(t["preview_note"].format(pw=preview_image.shape[1], ph=preview_image.shape[0], w=cols, h=rows))
+            # Nothing is rendered at full resolution until the download is clicked
+            st.download_button(t["export_full"], lambda: encode_png(render(original_image)),
+                               "transformed.png", "image/png", on_click="ignore")
+        
+        if chain:
+            program = compile_stack(steps, original_image.shape)
+            st.markdown(f"##### {t['chain_header']}")
+            st.write("\n".join(f"{i}. {step.label}" for i, step in enumerate(steps, 1)))
+            st.caption(t["chain_passes"].format(steps=len(steps), passes=len(program)))
+            with st.expander(t["chain_compiled"]):
+                for kind, array in program:
+                    if kind == "warp":
+                        st.markdown(f"**{t['matrix_geo']}**")
+                    else:
+                        st.markdown(f"**{t['matrix_ker']}** ({kernel_bank.plan_for(array).strategy})")
+                    st.write(array)
+        
         # Show Matrix/Kernel
         st.markdown("---")
         if matrix_to_show is not None:
@@ -1,12 +1,18 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from fpdf import FPDF
-import tempfile
 import os
+from columnar_io import UPLOAD_TYPES
+from dataset_cache import DatasetCache, load_cached_schema, load_cached_columns, DEFAULT_MAX_BYTES
+from streaming_stats import stream_descriptive_stats
+from composites import CompositeScore
+from reliability import reliability_analysis
+from bootstrap import descriptive_cis
+from stats_engine import (
+    get_descriptive_stats, analyze_association_logic, correlation_matrix,
+    NORMALITY_OPTIONS, PEARSON, SPEARMAN, CHI_SQUARE, GROUP_METHODS
+)
+# Heavy modules (scipy, matplotlib/seaborn, fpdf) are imported only on the tools page,
+# so Home and Team load with just streamlit/pandas/numpy.
 
 # ==========================================
 # PAGE CONFIGURATION
@@ -17,10 +23,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Set Seaborn Style (Earth Tone Palette for Charts)
-sns.set_theme(style="whitegrid")
-EARTH_PALETTE = sns.color_palette("BrBG", 10) # Brown-Blue-Green Earthy tones
-
 # ==========================================
 # 1. KAMUS BAHASA (TRANSLATION DICTIONARY)
 # ==========================================
@@ -44,13 +46,13 @@ We utilize Python libraries (Pandas, Scipy, Seaborn) to process data, calculate
         "home_sec1_note": "Includes: Mean, Median, Mode, Standard Deviation, and Frequency Tables.",
         "home_sec2": "2. Association Analysis",
         "home_sec2_desc": "Determining relationships between two variables (X and Y).",
-        "home_sec2_note": "Methods: Pearson (Numeric-Normal), Spearman (Numeric-NonNormal), Chi-Square (Categorical).",
+        "home_sec2_note": "Methods: Pearson (Numeric-Normal), Spearman (Numeric-NonNormal), Chi-Square (Categorical), t-test / ANOVA / Kruskal-Wallis (Numeric by Group).",
         "home_info": "👈 Navigate to 'Data Analysis Tools' to start analyzing your data!",
 
         # Tools Page
         "tools_title": "🛠️ Data Analysis Tools",
         "upload_header": "1. Upload Dataset",
-        "upload_label": "Upload CSV or Excel file",
+        "upload_label": "Upload CSV, Excel, Parquet, Feather or Arrow file",
         "preview_header": "Data Preview",
         "setup_header": "2. Variable Setup",
         "desc_header": "Descriptive Statistics",
@@ -58,7 +60,7 @@ We utilize Python libraries (Pandas, Scipy, Seaborn) to process data, calculate
         "select_vars": "Select Variables for Analysis",
         "var_x": "Select Variable X (Independent)",
         "var_y": "Select Variable Y (Dependent)",
-        "calc_composites": "Calculate Composite Scores (Summation)",
+        "calc_composites": "Calculate Composite Scores",
         "select_items_x": "Items for Composite X",
         "select_items_y": "Items for Composite Y",
         "generate_btn": "Run Analysis",
@@ -66,6 +68,30 @@ We utilize Python libraries (Pandas, Scipy, Seaborn) to process data, calculate
         "warn_upload": "Please upload a dataset via the tool to begin.",
         "dataset_info": "Dataset Info",
         "success_composite": "Composite scores calculated successfully!",
+        "composite_method": "Composite Method",
+        "composite_methods": ["Sum", "Mean"],
+        "reverse_items": "Reverse-coded items",
+        "item_weights": "Item weights",
+        "reliability_header": "Reliability (Cronbach's Alpha)",
+        "bootstrap_ci": "Bootstrap 95% confidence intervals",
+        "bootstrap_help": "Adds resampled CIs for the mean, median and correlation r (2000 replicates, fixed seed).",
+        "perm_test": "Permutation test p-values",
+        "perm_help": "Adds a permutation p-value for correlations and Chi-Square (up to 10,000 shuffles, stops early once clearly above or below 0.05).",
+        "normality_label": "Normality Test",
+        "mode_label": "Analysis Mode",
+        "mode_options": ["Single Pair (X vs Y)", "All Pairs (Correlation Matrix)", "Batch Pairs (Adjusted p-values)"],
+        "batch_x": "X variables",
+        "batch_y": "Y variables",
+        "batch_all_cat": "All categorical × categorical pairs",
+        "batch_results": "Batch Results",
+        "batch_download": "Download Results (CSV)",
+        "show_plots": "Show charts",
+        "matrix_cols": "Numeric columns for the matrix",
+        "matrix_method": "Correlation Method",
+        "matrix_r": "Correlation Coefficients (r)",
+        "matrix_p": "p-values",
+        "stream_mode": "Streaming mode (large CSV, descriptive statistics only)",
+        "stream_info": "Streaming mode: the file is read in chunks, the median is approximate, and association analysis is disabled.",
         
         # Stats Results
         "mean": "Mean",
@@ -112,13 +138,13 @@ Kami menggunakan pustaka Python (Pandas, Scipy, Seaborn) untuk memproses data, m
         "home_sec1_note": "Meliputi: Mean, Median, Modus, Standar Deviasi, dan Tabel Frekuensi.",
         "home_sec2": "2. Analisis Asosiasi",
         "home_sec2_desc": "Menentukan hubungan antara dua variabel (X dan Y).",
-        "home_sec2_note": "Metode: Pearson (Numerik-Normal), Spearman (Numerik-Tidak Normal), Chi-Square (Kategorikal).",
+        "home_sec2_note": "Metode: Pearson (Numerik-Normal), Spearman (Numerik-Tidak Normal), Chi-Square (Kategorikal), Uji-t / ANOVA / Kruskal-Wallis (Numerik per Kelompok).",
         "home_info": "👈 Buka 'Alat Analisis Data' untuk mulai menganalisis data Anda!",
 
         # Tools Page
         "tools_title": "🛠️ Alat Analisis Data",
         "upload_header": "1. Unggah Dataset",
-        "upload_label": "Unggah file CSV atau Excel",
+        "upload_label": "Unggah file CSV, Excel, Parquet, Feather atau Arrow",
         "preview_header": "Pratinjau Data",
         "setup_header": "2. Pengaturan Variabel",
         "desc_header": "Statistik Deskriptif",
@@ -126,7 +152,7 @@ Kami menggunakan pustaka Python (Pandas, Scipy, Seaborn) untuk memproses data, m
         "select_vars": "Pilih Variabel untuk Analisis",
         "var_x": "Pilih Variabel X (Independen)",
         "var_y": "Pilih Variabel Y (Dependen)",
-        "calc_composites": "Hitung Skor Komposit (Penjumlahan)",
+        "calc_composites": "Hitung Skor Komposit",
         "select_items_x": "Item untuk Komposit X",
         "select_items_y": "Item untuk Komposit Y",
         "generate_btn": "Mulai Analisis",
@@ -134,6 +160,30 @@ Kami menggunakan pustaka Python (Pandas, Scipy, Seaborn) untuk memproses data, m
         "warn_upload": "Silakan unggah dataset melalui alat ini untuk memulai.",
         "dataset_info": "Info Dataset",
         "success_composite": "Skor komposit berhasil dihitung!",
+        "composite_method": "Metode Komposit",
+        "composite_methods": ["Jumlah", "Rata-rata"],
+        "reverse_items": "Item berskor terbalik",
+        "item_weights": "Bobot item",
+        "reliability_header": "Reliabilitas (Alpha Cronbach)",
+        "bootstrap_ci": "Interval kepercayaan 95% bootstrap",
+        "bootstrap_help": "Menambahkan CI hasil resampling untuk rata-rata, median, dan korelasi r (2000 replikasi, seed tetap).",
+        "perm_test": "Nilai p uji permutasi",
+        "perm_help": "Menambahkan nilai p permutasi untuk korelasi dan Chi-Square (hingga 10.000 pengacakan, berhenti lebih awal bila jelas di atas atau di bawah 0,05).",
+        "normality_label": "Uji Normalitas",
+        "mode_label": "Mode Analisis",
+        "mode_options": ["Satu Pasangan (X vs Y)", "Semua Pasangan (Matriks Korelasi)", "Banyak Pasangan (p Terkoreksi)"],
+        "batch_x": "Variabel X",
+        "batch_y": "Variabel Y",
+        "batch_all_cat": "Semua pasangan kategorikal × kategorikal",
+        "batch_results": "Hasil Batch",
+        "batch_download": "Unduh Hasil (CSV)",
+        "show_plots": "Tampilkan grafik",
+        "matrix_cols": "Kolom numerik untuk matriks",
+        "matrix_method": "Metode Korelasi",
+        "matrix_r": "Koefisien Korelasi (r)",
+        "matrix_p": "Nilai p",
+        "stream_mode": "Mode streaming (CSV besar, hanya statistik deskriptif)",
+        "stream_info": "Mode streaming: file dibaca per bagian, median bersifat perkiraan, dan analisis asosiasi dinonaktifkan.",
         
         # Stats Results
         "mean": "Rata-rata (Mean)",
@@ -169,134 +219,6 @@ lang_choice = st.sidebar.radio("Language / Bahasa", ["English", "Bahasa Indonesi
 lang = "en" if lang_choice == "English" else "id"
 t = translations[lang]
 
-# ==========================================
-# 2. HELPER FUNCTIONS (LOGIC)
-# ==========================================
-
-def get_descriptive_stats(df, column):
-    """Calculates descriptive stats for a numerical column."""
-    desc = df[column].describe()
-    mode = df[column].mode()[0] if not df[column].mode().empty else np.nan
-    return {
-        "Mean": desc['mean'],
-        "Median": desc['50%'],
-        "Mode": mode,
-        "Min": desc['min'],
-        "Max": desc['max'],
-        "Std": desc['std']
-    }
-
-def check_normality(data):
-    """Performs Shapiro-Wilk test. Returns True if Normal, False otherwise."""
-    data = data.dropna()
-    if len(data) < 3: return False, 0
-    stat, p_value = stats.shapiro(data)
-    return p_value > 0.05, p_value
-
-def interpret_correlation(r, p):
-    """Returns text interpretation of correlation r and p-value."""
-    strength = ""
-    abs_r = abs(r)
-    if abs_r < 0.3: strength = "Weak/Lemah"
-    elif abs_r < 0.7: strength = "Moderate/Sedang"
-    else: strength = "Strong/Kuat"
-    
-    direction = "Positive (+)" if r > 0 else "Negative (-)"
-    significance = "Significant/Signifikan (p<0.05)" if p < 0.05 else "Not Significant/Tidak Signifikan"
-    
-    return strength, direction, significance
-
-def analyze_association_logic(df, col_x, col_y):
-    """Automatically selects method and computes stats."""
-    clean_df = df[[col_x, col_y]].dropna()
-    x = clean_df[col_x]
-    y = clean_df[col_y]
-    
-    if len(x) == 0:
-        return "Error", {"Error": "No valid data"}, None
-
-    is_x_numeric = pd.api.types.is_numeric_dtype(x)
-    is_y_numeric = pd.api.types.is_numeric_dtype(y)
-    
-    method = "Unknown"
-    res = {}
-    fig = None
-
-    if is_x_numeric and is_y_numeric:
-        norm_x, p_x = check_normality(x)
-        norm_y, p_y = check_normality(y)
-        
-        if norm_x and norm_y:
-            method = "Pearson Correlation"
-            r, p = stats.pearsonr(x, y)
-        else:
-            method = "Spearman Rank Correlation"
-            r, p = stats.spearmanr(x, y)
-            
-        strength, direction, sig = interpret_correlation(r, p)
-        res = {
-            "Coefficient (r)": f"{r:.4f}",
-            "p-value": f"{p:.4f}",
-            "Normality X (p)": f"{p_x:.4f}",
-            "Normality Y (p)": f"{p_y:.4f}",
-            "Interpretation": f"{strength}, {direction}, {sig}"
-        }
-        
-        # Scatterplot with Earth Tones
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.scatterplot(x=x, y=y, ax=ax, color='#8c564b', s=80, alpha=0.8) # Chestnut Brown
-        if method == "Pearson Correlation":
-            sns.regplot(x=x, y=y, ax=ax, scatter=False, color='#556B2F') # Olive Green
-        ax.set_title(f"Scatterplot: {col_x} vs {col_y}")
-        plt.tight_layout()
-        
-    elif not is_x_numeric and not is_y_numeric:
-        method = "Chi-Square Test"
-        contingency = pd.crosstab(x, y)
-        stat, p, dof, expected = stats.chi2_contingency(contingency)
-        
-        res = {
-            "Chi2 Stat": f"{stat:.4f}",
-            "p-value": f"{p:.4f}",
-            "Result": "Significant" if p < 0.05 else "Not Significant"
-        }
-        
-        # Heatmap with Earth Tones
-        fig, ax = plt.subplots(figsize=(6, 4))
-        sns.heatmap(contingency, annot=True, fmt='d', cmap="BrBG", ax=ax, linewidths=1)
-        ax.set_title(f"Heatmap: {col_x} vs {col_y}")
-        plt.tight_layout()
-        
-    else:
-        method = "Mixed Types (Not Supported)"
-        res = {"Error": "Please select two numeric or two categorical variables."}
-        
-    return method, res, fig
-
-# ==========================================
-# 3. PDF CLASS
-# ==========================================
-class PDFReport(FPDF):
-    def header(self):
-        self.set_font('Arial', 'B', 14)
-        self.cell(0, 10, 'Statistical Analysis Report', 0, 1, 'C')
-        self.ln(5)
-    def footer(self):
-        self.set_y(-15)
-        self.set_font('Arial', 'I', 8)
-        self.cell(0, 10, f'Page {self.page_no()}', 0, 0, 'C')
-    def chapter_title(self, title):
-        self.set_font('Arial', 'B', 12)
-        self.set_fill_color(220, 220, 220)
-        self.cell(0, 10, title, 0, 1, 'L', 1)
-        self.ln(4)
-    def chapter_body(self, body):
-        self.set_font('Arial', '', 11)
-        try: safe_body = body.encode('latin-1', 'replace').decode('latin-1')
-        except: safe_body = body
-        self.multi_cell(0, 5, safe_body)
-        self.ln()
-
 # ==========================================
 # NAVIGATION
 # ==========================================
@@ -331,25 +253,59 @@ if page == t["nav_options"][0]: # Home
 # PAGE 2: ANALYSIS TOOLS
 # ==========================================
 elif page == t["nav_options"][1]: # Tools
+    from stats_plots import (
+        build_histogram, build_boxplot, build_frequency_plot, build_association_figure,
+        plot_correlation_clustermap
+    )
+    from plot_cache import PlotCache, data_hash
+    from pdf_report import build_report_pdf, ReportJobs
+    from batch_association import run_batch_associations
+
     st.title(t["tools_title"])
     
     # --- Step 1: Upload ---
     st.header(t["upload_header"])
-    uploaded_file = st.file_uploader(t["upload_label"], type=["csv", "xlsx"])
+    uploaded_file = st.file_uploader(t["upload_label"], type=UPLOAD_TYPES)
+    stream_mode = st.checkbox(t["stream_mode"])
     
-    if uploaded_file:
+    if uploaded_file and stream_mode and uploaded_file.name.endswith('.csv'):
+        # One-pass chunked statistics: the full dataset is never held in memory
+        st.info(t["stream_info"])
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_excel(uploaded_file)
+            uploaded_file.seek(0)
+            stream_stats, stream_freq = stream_descriptive_stats(uploaded_file)
+        except Exception as e:
+            st.error(f"Error: {e}")
+            st.stop()
+
+        st.header(t["desc_header"])
+        if stream_stats:
+            st.table(pd.DataFrame(stream_stats).T)
+        for col, freq in stream_freq.items():
+            st.subheader(f"{t['freq_table']}: {col}")
+            freq = freq.reset_index()
+            freq.columns = ['Category', 'Frequency']
+            st.table(freq.head())
+
+    elif uploaded_file:
+        # Parsed uploads are cached per session so widget reruns skip re-parsing
+        if "dataset_cache" not in st.session_state:
+            st.session_state["dataset_cache"] = DatasetCache(
+                max_bytes=int(os.environ.get("STATS_CACHE_MAX_MB", DEFAULT_MAX_BYTES // 2**20)) * 2**20,
+                spill_dir=os.environ.get("STATS_CACHE_SPILL_DIR") or None
+            )
+        dataset_cache = st.session_state["dataset_cache"]
+        # Two-phase load: only the header/schema here; columns are read when an analysis needs them
+        try:
+            dataset_key, schema = load_cached_schema(uploaded_file, dataset_cache)
         except Exception as e:
             st.error(f"Error: {e}")
             st.stop()
 
         with st.expander(t["preview_header"], expanded=True):
-            st.dataframe(df.head(), use_container_width=True)
-            st.caption(f"{t['dataset_info']}: {df.shape[0]} rows, {df.shape[1]} columns")
+            st.dataframe(schema.preview, use_container_width=True)
+            n_rows = schema.n_rows if schema.n_rows is not None else "?"
+            st.caption(f"{t['dataset_info']}: {n_rows} rows, {len(schema.columns)} columns")
 
         st.markdown("---")
         
@@ -359,68 +315,218 @@ elif page == t["nav_options"][1]: # Tools
         
         with col_s1:
             st.subheader(t["calc_composites"])
-            cols_num = df.select_dtypes(include=np.number).columns.tolist()
+            cols_num = schema.numeric_columns
             items_x = st.multiselect(t["select_items_x"], cols_num)
             items_y = st.multiselect(t["select_items_y"], cols_num)
             
-            if items_x: df['X_Total'] = df[items_x].sum(axis=1)
-            if items_y: df['Y_Total'] = df[items_y].sum(axis=1)
-            if items_x or items_y: st.success(t["success_composite"])
+            composites = {}
+            if items_x: composites['X_Total'] = items_x
+            if items_y: composites['Y_Total'] = items_y
+            
+            composite_items = list(dict.fromkeys(items_x + items_y))
+            composite_method = "sum"
+            reverse_items, item_weights = [], {}
+            if composites:
+                method_label = st.radio(t["composite_method"], t["composite_methods"], horizontal=True)
+                composite_method = ["sum", "mean"][t["composite_methods"].index(method_label)]
+                reverse_items = st.multiselect(t["reverse_items"], composite_items, key="reverse_items")
+                with st.expander(t["item_weights"]):
+                    weights_df = st.data_editor(
+                        pd.DataFrame({"Item": composite_items, "Weight": 1.0}),
+                        disabled=["Item"], hide_index=True, use_container_width=True
+                    )
+                    item_weights = dict(zip(weights_df["Item"], weights_df["Weight"].fillna(1.0)))
+                st.success(t["success_composite"])
+            composite_spec = (composite_method, tuple(reverse_items), tuple(sorted(item_weights.items())))
+            
+        # Composites live in float32 side arrays per dataset; changing the selection only
+        # adds/subtracts the vectors of the items that changed
+        if st.session_state.get("composite_scores", (None,))[0] != dataset_key:
+            st.session_state["composite_scores"] = (dataset_key, {})
+        composite_scores = st.session_state["composite_scores"][1]
+        
+        def item_frame(items):
+            """Composite items as numbers; text further down than the schema sample becomes NaN."""
+            return load_cached_columns(uploaded_file, dataset_cache, items).apply(pd.to_numeric, errors="coerce")
+        
+        def item_values(item):
+            return item_frame([item])[item].to_numpy(dtype="float32", na_value=float("nan"))
+        
+        def composite_values(name):
+            score = composite_scores.get(name)
+            if score is None:
+                score = composite_scores[name] = CompositeScore(len(item_values(composites[name][0])))
+            score.update(composites[name], item_values, weights=item_weights, reverse=reverse_items)
+            return score.values(composite_method)
+            
+        def load_selected(columns):
+            """Loads only the given columns from the upload and attaches the requested composites."""
+            plain = [c for c in columns if c not in composites]
+            # Composite items (including ones being removed from a running composite) are fetched
+            # in the same read, so a CSV/Excel upload is parsed at most once per Generate
+            items = [i for name in composites if name in columns for i in composites[name]]
+            items += [i for score in composite_scores.values() for i in score.items]
+            frame = load_cached_columns(uploaded_file, dataset_cache, plain + items)[plain]
+            for name in composites:
+                if name in columns:
+                    values = composite_values(name)
+                    if frame.columns.empty: frame = pd.DataFrame(index=pd.RangeIndex(len(values)))
+                    frame[name] = values
+            return frame
             
         with col_s2:
             st.subheader(t["select_vars"])
-            all_cols = df.columns.tolist()
+            all_cols = schema.columns + [c for c in composites if c not in schema.columns]
             ix_x = all_cols.index('X_Total') if 'X_Total' in all_cols else 0
             ix_y = all_cols.index('Y_Total') if 'Y_Total' in all_cols else (1 if len(all_cols) > 1 else 0)
             
             col_x = st.selectbox(t["var_x"], all_cols, index=ix_x)
             col_y = st.selectbox(t["var_y"], all_cols, index=ix_y)
+            normality_choice = st.selectbox(t["normality_label"], list(NORMALITY_OPTIONS))
+            bootstrap_on = st.checkbox(t["bootstrap_ci"], help=t["bootstrap_help"])
+            permutation_on = st.checkbox(t["perm_test"], help=t["perm_help"])
 
         # --- Step 3: Action ---
         st.markdown("---")
-        if st.button(t["generate_btn"], type="primary"):
+        if "plot_cache" not in st.session_state:
+            st.session_state["plot_cache"] = PlotCache()
+        plot_cache = st.session_state["plot_cache"]
+        analysis_mode = st.radio(t["mode_label"], t["mode_options"], horizontal=True)
+        
+        if analysis_mode == t["mode_options"][1]: # All Pairs
+            matrix_cols = st.multiselect(t["matrix_cols"], cols_num, default=cols_num)
+            matrix_method = st.radio(t["matrix_method"], ["Pearson", "Spearman"], horizontal=True)
+            if st.button(t["generate_btn"], type="primary") and len(matrix_cols) >= 2:
+                df = load_selected(matrix_cols)
+                r_mat, p_mat, n_mat = correlation_matrix(df, matrix_cols, method=matrix_method.lower())
+                st.header(t["assoc_header"])
+                # Rasterized through the plot cache, which closes the figure after rendering
+                st.image(plot_cache.render(
+                    ("clustermap", dataset_key, matrix_method, tuple(matrix_cols)),
+                    lambda: plot_correlation_clustermap(r_mat, f"{matrix_method} Correlation Matrix")
+                ))
+                c_r, c_p = st.columns(2)
+                with c_r:
+                    st.subheader(t["matrix_r"])
+                    st.dataframe(r_mat.style.format("{:.3f}"), use_container_width=True)
+                with c_p:
+                    st.subheader(t["matrix_p"])
+                    st.dataframe(p_mat.style.format("{:.4f}"), use_container_width=True)
+        
+        elif analysis_mode == t["mode_options"][2]: # Batch Pairs
+            all_cat = st.checkbox(t["batch_all_cat"])
+            if not all_cat:
+                c_bx, c_by = st.columns(2)
+                with c_bx: batch_x = st.multiselect(t["batch_x"], all_cols)
+                with c_by: batch_y = st.multiselect(t["batch_y"], all_cols)
+            if st.button(t["generate_btn"], type="primary"):
+                if all_cat:
+                    pairs = "categorical"
+                    df = load_selected([c for c in schema.columns if c not in cols_num])
+                else:
+                    pairs = [(bx, by) for bx in batch_x for by in batch_y]
+                    df = load_selected(list(dict.fromkeys(batch_x + batch_y)))
+                bar = st.progress(0.0)
+                batch_res = run_batch_associations(
+                    df, pairs, normality=NORMALITY_OPTIONS[normality_choice],
+                    progress=lambda done, total: bar.progress(done / total)
+                )
+                st.header(t["batch_results"])
+                st.dataframe(batch_res, use_container_width=True)
+                st.download_button(t["batch_download"], batch_res.to_csv(index=False).encode("utf-8"),
+                                   "Batch_Associations.csv", "text/csv")
+        
+        else: # Single Pair
+            analysis_inputs = (dataset_key, col_x, col_y, normality_choice, tuple(items_x), tuple(items_y),
+                               composite_spec, bootstrap_on, permutation_on)
+            if st.button(t["generate_btn"], type="primary"):
+                st.session_state["analysis_inputs"] = analysis_inputs
+        
+        def compute_pair_analysis():
+            """Runs the single-pair analysis once; reruns only render what it returns."""
+            df = load_selected(list(dict.fromkeys([col_x, col_y])))
+            selected_cols = list(set([col_x, col_y]))
+            numeric_stats = get_descriptive_stats(
+                df, [c for c in selected_cols if pd.api.types.is_numeric_dtype(df[c])]
+            )
+            columns = {}
+            for col in selected_cols:
+                entry = columns[col] = {"hash": data_hash(df[col])}
+                if pd.api.types.is_numeric_dtype(df[col]):
+                    entry["stats"] = numeric_stats[col]
+                    if bootstrap_on:
+                        entry["stats"] = {**entry["stats"], **descriptive_cis(df[col])}
+                    if col in composites:
+                        # Alpha, alpha-if-deleted and item-total r all come from one covariance matrix
+                        entry["reliability"] = reliability_analysis(
+                            item_frame(composites[col]),
+                            composites[col], reverse=reverse_items
+                        )
+                else:
+                    freq = df[col].value_counts().reset_index()
+                    freq.columns = ['Category', 'Frequency']
+                    entry["freq"] = freq
+            method, res, _ = analyze_association_logic(
+                df, col_x, col_y, normality=NORMALITY_OPTIONS[normality_choice], with_plot=False,
+                bootstrap=bootstrap_on, permutation=permutation_on
+            )
+            return {"df": df, "columns": columns, "method": method, "res": res,
+                    "assoc_hash": data_hash(df[col_x], df[col_y])}
+        
+        # Results persist across reruns (e.g. chart toggles) until the inputs change; they are
+        # computed once per set of inputs and kept in the session, so a rerun only renders them
+        if analysis_mode == t["mode_options"][0] and st.session_state.get("analysis_inputs") == analysis_inputs:
             
+            stored = st.session_state.get("analysis_results")
+            if stored is None or stored[0] != analysis_inputs:
+                stored = st.session_state["analysis_results"] = (analysis_inputs, compute_pair_analysis())
+            results = stored[1]
+            df = results["df"]
             report_content = []
             
             # --- Analysis A: Descriptive ---
             st.header(t["desc_header"])
             report_content.append(("header", t["desc_header"]))
             
-            for col in list(set([col_x, col_y])):
+            for col, entry in results["columns"].items():
                 st.subheader(f"Variable: {col}")
                 report_content.append(("subheader", f"Variable: {col}"))
+                col_hash = entry["hash"]
                 
-                if pd.api.types.is_numeric_dtype(df[col]):
-                    stats_dict = get_descriptive_stats(df, col)
+                if "stats" in entry:
+                    stats_dict = entry["stats"]
                     st.table(pd.DataFrame(stats_dict, index=[0]))
                     
-                    c1, c2 = st.columns(2)
-                    with c1:
-                        fig1, ax1 = plt.subplots(figsize=(6,4))
-                        sns.histplot(df[col], kde=True, ax=ax1, color='#8c564b') # Brown
-                        ax1.set_title(f"Histogram: {col}")
-                        st.pyplot(fig1)
-                        report_content.append(("plot", fig1))
-                    with c2:
-                        fig2, ax2 = plt.subplots(figsize=(6,4))
-                        sns.boxplot(x=df[col], ax=ax2, color='#d9c0a3') # Beige
-                        ax2.set_title(f"Boxplot: {col}")
-                        st.pyplot(fig2)
-                        report_content.append(("plot", fig2))
+                    # Charts are only drawn when requested (or exported), then cached as PNG
+                    plots = [
+                        ((col, "histogram", col_hash), lambda s=df[col], c=col: build_histogram(s, c)),
+                        ((col, "boxplot", col_hash), lambda s=df[col], c=col: build_boxplot(s, c))
+                    ]
+                    if st.toggle(t["show_plots"], key=f"plots_{col}"):
+                        for c_plot, (key, builder) in zip(st.columns(2), plots):
+                            with c_plot: st.image(plot_cache.render(key, builder))
+                    report_content.extend(("plot", key, builder) for key, builder in plots)
                         
                     stats_str = ", ".join([f"{k}: {v:.2f}" for k,v in stats_dict.items()])
                     report_content.append(("text", stats_str))
+                    
+                    if "reliability" in entry:
+                        rel_summary, rel_table = entry["reliability"]
+                        st.markdown(f"**{t['reliability_header']}**")
+                        st.table(pd.DataFrame(rel_summary, index=[0]))
+                        st.dataframe(rel_table.style.format(precision=3), hide_index=True, use_container_width=True)
+                        report_content.append(("text", f"{t['reliability_header']}: " + ", ".join(
+                            f"{k}: {v:.3f}" for k, v in rel_summary.items()
+                        )))
                 
                 else:
-                    freq = df[col].value_counts().reset_index()
-                    freq.columns = ['Category', 'Frequency']
+                    freq = entry["freq"]
                     st.table(freq.head())
                     
-                    fig3, ax3 = plt.subplots(figsize=(6,4))
-                    sns.barplot(data=freq, x='Category', y='Frequency', ax=ax3, palette="BrBG")
-                    ax3.set_title(f"Frequency: {col}")
-                    st.pyplot(fig3)
-                    report_content.append(("plot", fig3))
+                    key, builder = (col, "frequency", col_hash), lambda f=freq, c=col: build_frequency_plot(f, c)
+                    if st.toggle(t["show_plots"], key=f"plots_{col}"):
+                        st.image(plot_cache.render(key, builder))
+                    report_content.append(("plot", key, builder))
                     report_content.append(("text", f"Categorical: {col}"))
 
             st.markdown("---")
@@ -429,8 +535,7 @@ elif page == t["nav_options"][1]: # Tools
             st.header(t["assoc_header"])
             report_content.append(("header", t["assoc_header"]))
             
-            method, res, fig_assoc = analyze_association_logic(df, col_x, col_y)
-            
+            method, res = results["method"], results["res"]
             st.info(f"**{t['auto_method']}:** {method}")
             report_content.append(("subheader", f"Method: {method}"))
             
@@ -442,36 +547,31 @@ elif page == t["nav_options"][1]: # Tools
                 report_content.append(("text", res_str))
             
             with c_plot:
-                if fig_assoc:
-                    st.pyplot(fig_assoc)
-                    report_content.append(("plot", fig_assoc))
+                if method in (PEARSON, SPEARMAN, CHI_SQUARE) + GROUP_METHODS:
+                    def build_assoc(pair=df[[col_x, col_y]], cx=col_x, cy=col_y, m=method):
+                        pair = pair.dropna()
+                        return build_association_figure(pair[cx], pair[cy], cx, cy, m)
+                    key = (f"{col_x}|{col_y}", method, results["assoc_hash"])
+                    if st.toggle(t["show_plots"], key="plots_assoc"):
+                        st.image(plot_cache.render(key, build_assoc))
+                    report_content.append(("plot", key, build_assoc))
                 elif "Error" in res:
                     st.error(res["Error"])
 
-            # --- PDF Generation ---
+            # --- PDF Generation (on demand) ---
+            # Nothing is built until the download is clicked; the build then runs on a
+            # background thread and repeat downloads of the same analysis reuse the bytes.
             st.markdown("---")
-            pdf = PDFReport()
-            pdf.add_page()
+            if "report_jobs" not in st.session_state:
+                st.session_state["report_jobs"] = ReportJobs()
+            report_jobs = st.session_state["report_jobs"]
+            report_key = analysis_inputs + (lang,)
             
-            try:
-                with tempfile.TemporaryDirectory() as tmpdirname:
-                    for item_type, content in report_content:
-                        if item_type == "header": pdf.chapter_title(content)
-                        elif item_type == "subheader": 
-                            pdf.set_font('Arial', 'B', 11)
-                            pdf.cell(0, 10, content.encode('latin-1','replace').decode('latin-1'), 0, 1)
-                        elif item_type == "text": pdf.chapter_body(content)
-                        elif item_type == "plot":
-                            fname = os.path.join(tmpdirname, f"p_{np.random.randint(100000)}.png")
-                            content.savefig(fname, bbox_inches='tight', dpi=100)
-                            if pdf.get_y() > 200: pdf.add_page()
-                            pdf.image(fname, w=150)
-                            pdf.ln(10)
-                    
-                    pdf_bytes = pdf.output(dest='S').encode('latin-1', 'replace')
-                    st.download_button(t["export_btn"], pdf_bytes, "Analysis_Report.pdf", "application/pdf")
-            except Exception as e:
-                st.error(f"PDF Error: {e}")
+            def pdf_data(key=report_key, content=report_content, cache=plot_cache):
+                return report_jobs.result(key, build_report_pdf, content, cache.render)
+            
+            st.download_button(t["export_btn"], pdf_data, "Analysis_Report.pdf", "application/pdf",
+                               on_click="ignore")
                 
     else:
         st.warning(t["warn_upload"])
@@ -0,0 +1,183 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from stats_engine import (
+    correlation_test, chi_square_from_codes, group_test, CHI_SQUARE
+)
+
+# ==========================================
+# BATCH ASSOCIATION RUNNER
+# ==========================================
+PARALLEL_MIN_PAIRS = 16  # Below this, process start-up costs more than it saves
+RESULT_COLUMNS = ["X", "Y", "Method", "Statistic", "p-value", "N"]
+
+
+def adjust_pvalues(p_values, method="bh"):
+    """Multiple-testing correction ('bonferroni' or Benjamini-Hochberg 'bh'); NaNs are skipped."""
+    p = np.asarray(p_values, dtype=np.float64)
+    out = np.full(p.shape, np.nan)
+    ok = ~np.isnan(p)
+    m = ok.sum()
+    if m == 0:
+        return out
+    if method == "bonferroni":
+        out[ok] = np.minimum(p[ok] * m, 1.0)
+    elif method == "bh":
+        order = np.argsort(p[ok])
+        ranked = p[ok][order] * m / np.arange(1, m + 1)
+        # Enforce monotonicity from the largest p-value down
+        ranked = np.minimum.accumulate(ranked[::-1])[::-1]
+        adjusted = np.empty(m)
+        adjusted[order] = np.minimum(ranked, 1.0)
+        out[ok] = adjusted
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+    return out
+
+
+def categorical_pairs(df, columns=None):
+    """All categorical x categorical pairs (the "all categorical" batch preset)."""
+    columns = columns if columns is not None else df.columns
+    cats = [c for c in columns if not pd.api.types.is_numeric_dtype(df[c])]
+    return list(itertools.combinations(cats, 2))
+
+
+class SharedColumns:
+    """Column buffers packed into one shared-memory block that workers map without copying.
+
+    Numeric columns are stored as float64 (NaN = missing); other columns are
+    factorized into int64 codes (-1 = missing).
+    """
+
+    def __init__(self, df, columns):
+        self.columns = list(columns)
+        self.n_rows = len(df)
+        self.numeric = [pd.api.types.is_numeric_dtype(df[c]) for c in self.columns]
+        self.n_categories = []
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * self.n_rows * len(self.columns)))
+        for j, col in enumerate(self.columns):
+            if self.numeric[j]:
+                values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+                self.view(j, np.float64)[:] = values
+                self.n_categories.append(0)
+            else:
+                codes, uniques = pd.factorize(df[col], sort=True)
+                self.view(j, np.int64)[:] = codes
+                self.n_categories.append(len(uniques))
+
+    def view(self, j, dtype):
+        return np.ndarray((self.n_rows,), dtype=dtype, buffer=self.shm.buf, offset=8 * self.n_rows * j)
+
+    def spec(self):
+        """Picklable description used by workers to attach to the block."""
+        return self.shm.name, self.n_rows, self.numeric, self.n_categories
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# Worker-side state, set once per process by _attach
+_WORKER = {}
+
+
+def _attach(spec):
+    name, n_rows, numeric, n_categories = spec
+    # track=False: the parent owns (and unlinks) the block
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        shm = shared_memory.SharedMemory(name=name)
+    _WORKER.update(shm=shm, n_rows=n_rows, numeric=numeric, n_categories=n_categories)
+
+
+def _column(j):
+    dtype = np.float64 if _WORKER["numeric"][j] else np.int64
+    return np.ndarray((_WORKER["n_rows"],), dtype=dtype, buffer=_WORKER["shm"].buf, offset=8 * _WORKER["n_rows"] * j)
+
+
+def _run_pair(task):
+    """Statistics for one (i, j) column pair; no figures are built."""
+    i, j, normality = task
+    num_x, num_y = _WORKER["numeric"][i], _WORKER["numeric"][j]
+    x, y = _column(i), _column(j)
+    if num_x and num_y:
+        keep = ~(np.isnan(x) | np.isnan(y))
+        n = int(keep.sum())
+        if n < 3:
+            return i, j, "Error", np.nan, np.nan, n
+        corr = correlation_test(x[keep], y[keep], normality=normality)
+        return i, j, corr["method"], corr["r"], corr["p"], n
+    if not num_x and not num_y:
+        n = int(((x >= 0) & (y >= 0)).sum())
+        if n == 0:
+            return i, j, "Error", np.nan, np.nan, n
+        result, _ = chi_square_from_codes(x, y, _WORKER["n_categories"][i], _WORKER["n_categories"][j])
+        return i, j, CHI_SQUARE, result["chi2"], result["p"], n
+    values, codes = (x, y) if num_x else (y, x)
+    codes = codes.astype(np.int64)
+    keep = ~np.isnan(values) & (codes >= 0)
+    n = int(keep.sum())
+    n_groups = _WORKER["n_categories"][j if num_x else i]
+    summary = group_test(values[keep], codes[keep], n_groups, normality=normality)
+    if summary["method"] == "Error":
+        return i, j, "Error", np.nan, np.nan, n
+    return i, j, summary["method"], summary["stat"], summary["p"], n
+
+
+def run_batch_associations(df, pairs, normality="auto", max_workers=None, progress=None):
+    """Runs the association tests for many (X, Y) pairs and returns a tidy results table.
+
+    `pairs` is a list of (col_x, col_y) tuples or the string "categorical"
+    for every categorical x categorical pair. Pairs run in a process pool
+    over shared-memory column buffers; `progress(done, total)` is called as
+    each pair completes. Bonferroni and Benjamini-Hochberg adjusted p-values
+    are added as extra columns.
+    """
+    if isinstance(pairs, str):
+        if pairs != "categorical":
+            raise ValueError(f"Unknown pair preset: {pairs}")
+        pairs = categorical_pairs(df)
+    pairs = [(x, y) for x, y in pairs if x != y]
+    if not pairs:
+        return pd.DataFrame(columns=RESULT_COLUMNS + ["p (Bonferroni)", "p (BH)"])
+
+    columns = list(dict.fromkeys(c for pair in pairs for c in pair))
+    index = {c: k for k, c in enumerate(columns)}
+    tasks = [(index[x], index[y], normality) for x, y in pairs]
+    max_workers = max_workers or os.cpu_count() or 1
+
+    shared = SharedColumns(df, columns)
+    rows = []
+    try:
+        if max_workers == 1 or len(tasks) < PARALLEL_MIN_PAIRS:
+            _attach(shared.spec())
+            for k, task in enumerate(tasks, 1):
+                rows.append(_run_pair(task))
+                if progress: progress(k, len(tasks))
+            _WORKER.clear()
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach,
+                                     initargs=(shared.spec(),)) as pool:
+                futures = [pool.submit(_run_pair, task) for task in tasks]
+                for k, future in enumerate(as_completed(futures), 1):
+                    rows.append(future.result())
+                    if progress: progress(k, len(tasks))
+    finally:
+        shared.close()
+
+    # Restore request order (as_completed yields in completion order)
+    order = {(i, j): k for k, (i, j, _) in enumerate(tasks)}
+    rows.sort(key=lambda row: order[(row[0], row[1])])
+    result = pd.DataFrame(
+        [(columns[i], columns[j], method, stat, p, n) for i, j, method, stat, p, n in rows],
+        columns=RESULT_COLUMNS
+    )
+    result["p (Bonferroni)"] = adjust_pvalues(result["p-value"], "bonferroni")
+    result["p (BH)"] = adjust_pvalues(result["p-value"], "bh")
+    return result
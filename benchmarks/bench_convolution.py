@@ -0,0 +1,62 @@
+"""Benchmark: cv2.filter2D (the original apply_convolution) vs the convolution engine.
+
+Box, Gaussian and dense random kernels across kernel and image sizes; each
+row also reports the largest pixel difference from filter2D.
+
+Run from the repository root:  python benchmarks/bench_convolution.py [--quick]
+"""
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convolution import convolve, fft_filter, gaussian_kernel, plan_convolution  # noqa: E402
+
+
+def apply_convolution(image, kernel):
+    """The original app.py implementation."""
+    return cv2.filter2D(image, -1, kernel)
+
+
+def timed(fn, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def kernels(rng, side):
+    dense = rng.random((side, side)).astype(np.float32)
+    return {
+        "box": np.ones((side, side), np.float32) / (side * side),
+        "gaussian": gaussian_kernel((side - 1) / 6),
+        "dense": dense / dense.sum(),
+    }
+
+
+def main(quick=False):
+    rng = np.random.default_rng(42)
+    image_sizes = [(750, 1000), (3000, 4000)] if not quick else [(750, 1000)]
+    sides = [3, 5, 9, 15, 25, 41, 61] if not quick else [5, 25, 61]
+    fft_filter(np.zeros((8, 8, 3), np.uint8), np.ones((3, 3), np.float32))  # Import scipy.signal up front
+
+    print(f"{'image':>11} {'kernel':>12} {'strategy':>10} {'filter2D s':>11} {'engine s':>10} {'speedup':>8} {'max diff':>8}")
+    for rows, cols in image_sizes:
+        image = rng.integers(0, 256, (rows, cols, 3), dtype=np.uint8)
+        for side in sides:
+            for name, kernel in kernels(rng, side).items():
+                plan = plan_convolution(kernel)
+                t_old, old = timed(lambda: apply_convolution(image, kernel))
+                t_new, new = timed(lambda: convolve(image, kernel, plan))
+                diff = int(np.abs(old.astype(np.int16) - new).max())
+                print(f"{cols:>5}x{rows:<5} {name:>8} {kernel.shape[0]:>3} {plan.strategy:>10} "
+                      f"{t_old:>11.4f} {t_new:>10.4f} {t_old / t_new:>7.1f}x {diff:>8}")
+
+
+if __name__ == "__main__":
+    main(quick="--quick" in sys.argv[1:])
@@ -0,0 +1,80 @@
+"""Import-time benchmark for CI: cold-start cost of the apps and the engine modules.
+
+Each target runs in a fresh interpreter under `python -X importtime`; the
+self+cumulative times are summed per top-level package. Heavy packages that
+must not load on the landing (Home) page are reported, and --max-ms turns
+the run into a pass/fail gate.
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py [--json out.json] [--max-ms 3000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("scipy", "matplotlib", "seaborn", "fpdf", "cv2", "PIL")
+
+# (label, argv after `python -X importtime`). The Streamlit scripts run in bare
+# mode, which renders the default page (Home) without a server.
+TARGETS = [
+    ("appstatitics13.py (Home page)", ["appstatitics13.py"]),
+    ("app.py (Home page)", ["app.py"]),
+    ("stats_engine", ["-c", "import stats_engine"]),
+    ("stats_cli --help", ["stats_cli.py", "--help"]),
+]
+
+
+def measure(argv):
+    """Returns ({top_level_package: cumulative_us}, total_us, loaded_packages) for one cold start."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    per_package = {}
+    loaded = set()
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        loaded.add(name.strip().split(".")[0])
+        # Nesting is shown by extra indentation; only top-level imports are summed
+        if name.startswith("  "):
+            continue
+        package = name.strip().split(".")[0]
+        per_package[package] = per_package.get(package, 0) + int(cumulative_us)
+        total += int(cumulative_us)
+    return per_package, total, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", help="Write results to this JSON file (for CI trend tracking)")
+    parser.add_argument("--max-ms", type=float, help="Fail if any target's total import time exceeds this")
+    parser.add_argument("--top", type=int, default=8, help="Packages to list per target")
+    args = parser.parse_args(argv)
+
+    report = {}
+    failed = False
+    for label, target in TARGETS:
+        per_package, total, loaded = measure(target)
+        heavy = sorted(p for p in loaded if p in HEAVY)
+        report[label] = {"total_ms": total / 1000, "heavy": heavy,
+                         "packages_ms": {p: us / 1000 for p, us in per_package.items()}}
+        print(f"{label:32s} {total / 1000:9.1f} ms   heavy: {', '.join(heavy) or '-'}")
+        for package, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:args.top]:
+            print(f"    {package:28s} {us / 1000:9.1f} ms")
+        if args.max_ms is not None and total / 1000 > args.max_ms:
+            failed = True
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
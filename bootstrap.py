@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# ==========================================
+# BOOTSTRAP CONFIDENCE INTERVALS (BATCHED RESAMPLING)
+# ==========================================
+DEFAULT_REPS = 2000
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024  # Working-set budget for resample blocks (all workers)
+SEED_BLOCK = 64  # Replicates drawn from one child seed (fixed, so results do not depend on the budget)
+BOOTSTRAP_SEED = 0
+CONFIDENCE = 0.95
+
+
+def _pearson_rows(x, y):
+    """Row-wise Pearson r of two (reps, n) blocks from fused sums (no centered temporaries).
+
+    Inputs should be roughly centered (the callers center once, before
+    resampling) so the sum-of-squares form does not lose precision.
+    """
+    n = x.shape[1]
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx = np.einsum("ij,ij->i", x, x)
+    syy = np.einsum("ij,ij->i", y, y)
+    sxy = np.einsum("ij,ij->i", x, y)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+
+
+def _spearman_rows(x, y):
+    from scipy.stats import rankdata
+    # Ranks are taken within each resample, so ties created by resampling are averaged
+    center = (x.shape[1] + 1) / 2
+    return _pearson_rows(rankdata(x, axis=1) - center, rankdata(y, axis=1) - center)
+
+
+# statistic -> (kernel over gathered (reps, n) blocks, number of input columns)
+_KERNELS = {
+    "mean": (lambda x: x.mean(axis=1), 1),
+    "median": (lambda x: np.median(x, axis=1), 1),
+    "pearson": (_pearson_rows, 2),
+    "spearman": (_spearman_rows, 2),
+}
+
+
+def _block_plan(n, n_columns, idx_bytes, workers, memory_bytes):
+    """(workers, rows per gather) so that all concurrently live resample blocks fit the budget.
+
+    When a single replicate already needs more than the budget share of a
+    worker, fewer workers run instead of each one overshooting it.
+    """
+    # Index row + gathered float64 rows + about one temporary per column
+    per_rep = n * (idx_bytes + 16 * n_columns)
+    workers = int(max(1, min(workers, memory_bytes // per_rep)))
+    rows = int(np.clip(memory_bytes // (per_rep * workers), 1, SEED_BLOCK))
+    return workers, rows
+
+
+def bootstrap_distribution(statistic, *columns, reps=DEFAULT_REPS, seed=BOOTSTRAP_SEED,
+                           memory_bytes=DEFAULT_MEMORY_BYTES, max_workers=None):
+    """Bootstrap replicates of `statistic` ('mean', 'median', 'pearson', 'spearman').
+
+    Replicates come in blocks of SEED_BLOCK, each drawn from its own child
+    seed and run on a thread pool. Within a block, indices are drawn as
+    (rows, n) matrices sized from `memory_bytes` and every replicate in them
+    is computed at once; the block's generator continues from one gather to
+    the next, so the result depends only on `seed`, not on the memory budget
+    or the number of workers.
+    """
+    kernel, n_columns = _KERNELS[statistic]
+    if len(columns) != n_columns:
+        raise ValueError(f"'{statistic}' takes {n_columns} column(s)")
+    columns = [np.asarray(c, dtype=np.float64) for c in columns]
+    if statistic == "pearson":
+        columns = [c - c.mean() for c in columns]
+    n = columns[0].size
+    idx_dtype = np.int32 if n < 2 ** 31 else np.int64
+    workers, rows = _block_plan(n, n_columns, np.dtype(idx_dtype).itemsize,
+                                max_workers or os.cpu_count() or 1, memory_bytes)
+    sizes = [SEED_BLOCK] * (reps // SEED_BLOCK) + ([reps % SEED_BLOCK] if reps % SEED_BLOCK else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    def run(block_seed, size):
+        rng = np.random.default_rng(block_seed)
+        out = []
+        for start in range(0, size, rows):
+            idx = rng.integers(0, n, size=(min(rows, size - start), n), dtype=idx_dtype)
+            out.append(kernel(*(np.take(c, idx) for c in columns)))
+        return np.concatenate(out)
+
+    if workers == 1 or len(sizes) == 1:
+        blocks = [run(block_seed, size) for block_seed, size in zip(seeds, sizes)]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(sizes))) as pool:
+            blocks = list(pool.map(run, seeds, sizes))
+    return np.concatenate(blocks)
+
+
+def bootstrap_ci(statistic, *columns, confidence=CONFIDENCE, **kwargs):
+    """Percentile bootstrap CI. Returns (estimate, low, high); NaN when there is too little data."""
+    kernel, _ = _KERNELS[statistic]
+    columns = [np.asarray(c, dtype=np.float64) for c in columns]
+    if columns[0].size < 2:
+        return np.nan, np.nan, np.nan
+    if statistic == "pearson":
+        columns = [c - c.mean() for c in columns]
+    estimate = float(kernel(*(c[None, :].copy() for c in columns))[0])
+    replicates = bootstrap_distribution(statistic, *columns, **kwargs)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(replicates, [tail, 100 - tail])
+    return estimate, float(low), float(high)
+
+
+def descriptive_cis(series, confidence=CONFIDENCE, **kwargs):
+    """Bootstrap CIs for the mean and median of a numeric Series, as extra descriptive-table keys."""
+    values = series.dropna().to_numpy(dtype=np.float64)
+    pct = f"{confidence:.0%}"
+    out = {}
+    for name, statistic in (("Mean", "mean"), ("Median", "median")):
+        _, low, high = bootstrap_ci(statistic, values, confidence=confidence, **kwargs)
+        out[f"{name} {pct} CI Low"] = low
+        out[f"{name} {pct} CI High"] = high
+    return out
@@ -0,0 +1,186 @@
+import hashlib
+import io
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# COLUMNAR / FAST-PATH INGESTION
+# ==========================================
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+CSV_TYPES = ("csv",)
+EXCEL_TYPES = ("xlsx", "xls")
+PARQUET_TYPES = ("parquet",)
+ARROW_TYPES = ("feather", "arrow", "ipc")
+# Parquet/Arrow uploads need pyarrow, so they are only offered when it is installed
+UPLOAD_TYPES = list(CSV_TYPES + EXCEL_TYPES + (PARQUET_TYPES + ARROW_TYPES if HAVE_PYARROW else ()))
+# Formats that read a column subset without parsing the rest (CSV/Excel still tokenize everything)
+PROJECTED_TYPES = PARQUET_TYPES + ARROW_TYPES
+
+SCHEMA_SAMPLE_ROWS = 1000  # Rows parsed to infer CSV/Excel column types for the widgets
+
+# schema key -> {column: dtype name} of the numeric columns inferred on the first parse of that
+# schema. Only numeric dtypes are kept: they fail loudly on text (and the read falls back to
+# inference), whereas a cached string dtype would silently keep a now-numeric column categorical.
+_DTYPE_CACHE = {}
+
+# Lightweight description of an upload: enough to fill the variable pickers
+DatasetSchema = namedtuple("DatasetSchema", ["columns", "numeric_columns", "n_rows", "preview"])
+
+
+def file_kind(name):
+    """Lower-case extension without the dot ('csv', 'parquet', ...)."""
+    return os.path.splitext(name)[1].lower().lstrip(".")
+
+
+def schema_key(kind, header):
+    """Identifies a file schema by its type and header bytes (CSV header line)."""
+    return hashlib.blake2b(kind.encode() + b"\0" + header, digest_size=16).hexdigest()
+
+
+def downcast_numeric(df):
+    """Shrinks integer columns to the smallest type that holds their range (Likert 1-5 -> int8).
+
+    Floats are left as float64 so statistics keep full precision. The frame
+    is modified in place and returned.
+    """
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            if isinstance(df[col].dtype, np.dtype):
+                df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
+
+
+def _read_csv(source, header, columns=None):
+    """CSV through the multithreaded pyarrow engine when available, reusing cached dtypes."""
+    key = schema_key("csv", header)
+    engine = "pyarrow" if HAVE_PYARROW else "c"
+    cached = _DTYPE_CACHE.get(key)
+    if cached is not None:
+        if columns is not None:
+            cached = {col: dtype for col, dtype in cached.items() if col in columns}
+        try:
+            source.seek(0)
+            # Known schema: numeric columns skip type sniffing
+            return pd.read_csv(source, engine=engine, dtype=cached, usecols=columns)
+        except (ValueError, TypeError):
+            # Data no longer fits the cached types (e.g. new missing values): infer again
+            _DTYPE_CACHE.pop(key, None)
+    source.seek(0)
+    df = pd.read_csv(source, engine=engine, usecols=columns)
+    _DTYPE_CACHE.setdefault(key, {}).update({
+        col: str(dtype) for col, dtype in df.dtypes.items()
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    })
+    return df
+
+
+def _read_arrow(source, columns=None):
+    """Arrow IPC file or stream (Feather v2) from a path or buffer, memory-mapped for paths."""
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    if isinstance(source, str):
+        source = pa.memory_map(source, "r")
+    try:
+        table = ipc.open_file(source).read_all()
+    except pa.ArrowInvalid:
+        source.seek(0)
+        table = ipc.open_stream(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas()
+
+
+def read_upload(name, data, columns=None):
+    """Parses raw upload bytes into a DataFrame based on the file extension.
+
+    Only `columns` are materialised when given (usecols / Arrow projection).
+    Parquet/Arrow are read zero-copy from the upload buffer; integer columns
+    are downcast after parsing.
+    """
+    kind = file_kind(name)
+    if kind in CSV_TYPES:
+        df = _read_csv(io.BytesIO(data), data.split(b"\n", 1)[0], columns)
+    elif kind in EXCEL_TYPES:
+        df = pd.read_excel(io.BytesIO(data), usecols=columns)
+    elif kind in PARQUET_TYPES:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        df = pq.read_table(pa.BufferReader(data), columns=columns).to_pandas()
+    elif kind in ARROW_TYPES:
+        import pyarrow as pa
+        df = _read_arrow(pa.BufferReader(data), columns)
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+    return downcast_numeric(df)
+
+
+def read_schema(name, data, preview_rows=5):
+    """Reads only the header/schema (plus a few rows) of an upload.
+
+    Columnar formats answer from their metadata; CSV/Excel parse a small
+    sample, so numeric detection there is based on the first
+    SCHEMA_SAMPLE_ROWS rows.
+    """
+    kind = file_kind(name)
+    if kind in CSV_TYPES:
+        sample = pd.read_csv(io.BytesIO(data), nrows=SCHEMA_SAMPLE_ROWS)
+        n_lines = data.count(b"\n") + (0 if data.endswith(b"\n") else 1)
+        n_rows = max(n_lines - 1, 0)
+    elif kind in EXCEL_TYPES:
+        sample = pd.read_excel(io.BytesIO(data), nrows=SCHEMA_SAMPLE_ROWS)
+        n_rows = None
+    elif kind in PARQUET_TYPES:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(pa.BufferReader(data))
+        n_rows = pf.metadata.num_rows
+        first = next(pf.iter_batches(batch_size=preview_rows), None)
+        sample = first.to_pandas() if first is not None else pf.schema_arrow.empty_table().to_pandas()
+    elif kind in ARROW_TYPES:
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+        try:
+            reader = ipc.open_file(pa.BufferReader(data))
+            batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+        except pa.ArrowInvalid:
+            # Stream format (no footer), accepted by _read_arrow too; batches are zero-copy views
+            reader = ipc.open_stream(pa.BufferReader(data))
+            batches = list(reader)
+        n_rows = sum(batch.num_rows for batch in batches)
+        sample = batches[0].slice(0, preview_rows).to_pandas() if batches \
+            else reader.schema.empty_table().to_pandas()
+    else:
+        raise ValueError(f"Unsupported file type: {name}")
+    numeric = sample.select_dtypes(include=np.number).columns.tolist()
+    return DatasetSchema(sample.columns.tolist(), numeric, n_rows, sample.head(preview_rows))
+
+
+def read_path(path, columns=None):
+    """Reads a file from disk, memory-mapping Parquet/Arrow and projecting `columns` if given."""
+    kind = file_kind(path)
+    if kind in CSV_TYPES:
+        with open(path, "rb") as fh:
+            header = fh.readline()
+        if columns is not None:
+            engine = "pyarrow" if HAVE_PYARROW else "c"
+            df = pd.read_csv(path, engine=engine, usecols=columns)
+        else:
+            with open(path, "rb") as fh:
+                df = _read_csv(fh, header)
+    elif kind in EXCEL_TYPES:
+        df = pd.read_excel(path, usecols=columns)
+    elif kind in PARQUET_TYPES:
+        df = pd.read_parquet(path, columns=columns, memory_map=True)
+    elif kind in ARROW_TYPES:
+        df = _read_arrow(path, columns)
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+    return downcast_numeric(df)
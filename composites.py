@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# COMPOSITE SCORES (X_Total / Y_Total)
+# ==========================================
+COMPOSITE_METHODS = ("sum", "mean")
+REBUILD_EVERY = 64  # Incremental float32 updates between exact rebuilds (bounds rounding drift)
+
+
+def item_contribution(values, weight=1.0, reverse=False, scale=None):
+    """Weighted (optionally reverse-coded) item vector and its validity weight, as float32.
+
+    Missing values contribute 0 to the total and 0 to the weight, matching
+    pandas' skipna row sums. Reverse coding maps v -> lo + hi - v on the
+    item's scale (observed min/max unless `scale` is given).
+    """
+    v = np.asarray(values, dtype=np.float32)
+    valid = ~np.isnan(v)
+    if reverse:
+        lo, hi = scale if scale is not None else (np.nanmin(v), np.nanmax(v))
+        v = (lo + hi) - v
+    contrib = np.where(valid, v * np.float32(weight), np.float32(0))
+    return contrib, valid.astype(np.float32) * np.float32(weight)
+
+
+def _finish(total, weight_sum, method):
+    if method == "sum":
+        return total
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(weight_sum > 0, total / weight_sum, np.float32(np.nan)).astype(np.float32)
+
+
+def composite_score(df, items, weights=None, reverse=(), method="sum"):
+    """Composite of the item columns in one pass (sum or weighted mean, reverse coding)."""
+    total = np.zeros(len(df), dtype=np.float32)
+    weight_sum = np.zeros(len(df), dtype=np.float32)
+    for item in items:
+        w = 1.0 if weights is None else weights.get(item, 1.0)
+        contrib, wv = item_contribution(df[item].to_numpy(dtype=np.float32, na_value=np.nan), w, item in reverse)
+        total += contrib
+        weight_sum += wv
+    return pd.Series(_finish(total, weight_sum, method), index=df.index)
+
+
+class CompositeScore:
+    """Composite maintained incrementally in float32 side arrays.
+
+    `update` diffs the requested item spec against the current one and only
+    adds or subtracts the vectors of items that changed, so selecting or
+    deselecting one item costs O(N) rather than O(N * k).
+    """
+
+    def __init__(self, n_rows):
+        self.n_rows = n_rows
+        self.total = np.zeros(n_rows, dtype=np.float32)
+        self.weight_sum = np.zeros(n_rows, dtype=np.float32)
+        self.items = {}  # item -> (weight, reverse, scale)
+        self._updates = 0
+
+    def _apply(self, values, weight, reverse, scale, sign):
+        contrib, wv = item_contribution(values, weight, reverse, scale)
+        if sign > 0:
+            self.total += contrib
+            self.weight_sum += wv
+        else:
+            self.total -= contrib
+            self.weight_sum -= wv
+
+    def update(self, items, get_column, weights=None, reverse=()):
+        """Brings the composite to `items` (with weights / reverse-coded items).
+
+        `get_column(item)` returns the item's values as an array; it is only
+        called for items that are added, removed or re-specified.
+        """
+        wanted = {}
+        for item in items:
+            wanted[item] = (1.0 if weights is None else float(weights.get(item, 1.0)), item in reverse)
+
+        changed = [i for i in self.items if i not in wanted or wanted[i] != self.items[i][:2]]
+        added = [i for i in wanted if i not in self.items or i in changed]
+        if self.items and self._updates + len(changed) + len(added) > REBUILD_EVERY:
+            return self.rebuild(items, get_column, weights, reverse)
+
+        for item in changed:
+            weight, rev, scale = self.items.pop(item)
+            self._apply(get_column(item), weight, rev, scale, -1)
+        for item in added:
+            values = np.asarray(get_column(item), dtype=np.float32)
+            weight, rev = wanted[item]
+            scale = (np.nanmin(values), np.nanmax(values)) if rev else None
+            self._apply(values, weight, rev, scale, +1)
+            self.items[item] = (weight, rev, scale)
+        self._updates += len(changed) + len(added)
+        if not self.items:
+            # Nothing selected: reset exactly instead of carrying rounding residue
+            self.total[:] = 0
+            self.weight_sum[:] = 0
+        return self
+
+    def rebuild(self, items, get_column, weights=None, reverse=()):
+        """Recomputes the composite from scratch (also clears accumulated float32 drift)."""
+        self.total[:] = 0
+        self.weight_sum[:] = 0
+        self.items = {}
+        self._updates = 0
+        self.update(items, get_column, weights, reverse)
+        self._updates = 0
+        return self
+
+    def values(self, method="sum"):
+        """The composite as a float32 array ('sum' or weighted 'mean' of the valid items)."""
+        if method not in COMPOSITE_METHODS:
+            raise ValueError(f"Unknown composite method: {method}")
+        return _finish(self.total, self.weight_sum, method)
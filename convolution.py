@@ -0,0 +1,99 @@
+from collections import namedtuple
+
+import numpy as np
+
+# ==========================================
+# CONVOLUTION ENGINE (BOX, SEPARABLE, FFT, DIRECT)
+# ==========================================
+# Results match cv2.filter2D(image, -1, kernel): correlation, centred anchor,
+# BORDER_REFLECT_101 and saturated output in the image's dtype.
+SEPARABLE_TOLERANCE = 1e-6  # Relative size of the 2nd singular value still treated as rank 1
+# filter2D already switches to an internal DFT from about 11x11, so the scipy FFT
+# only pays off for very large dense kernels (see benchmarks/bench_convolution.py)
+FFT_MIN_SIDE = 61
+DFT_TAPS = 260  # Per-pixel cost of filter2D's DFT path (and of the FFT), in direct-kernel taps
+BOX_TAPS = 8
+
+# strategy: "box" | "separable" | "fft" | "direct"; column/row: 1D factors of a rank-1 kernel
+ConvolutionPlan = namedtuple("ConvolutionPlan", ["strategy", "kernel", "column", "row"])
+
+
+def separable_factors(kernel, tolerance=SEPARABLE_TOLERANCE):
+    """(column, row) with kernel == outer(column, row) when the kernel has rank 1, else None."""
+    u, s, vt = np.linalg.svd(np.asarray(kernel, dtype=np.float64))
+    if s[0] == 0 or (s.size > 1 and s[1] > tolerance * s[0]):
+        return None
+    root = np.sqrt(s[0])
+    return u[:, 0] * root, vt[0] * root
+
+
+def plan_convolution(kernel):
+    """Picks the cheapest exact way to apply `kernel`.
+
+    A constant kernel averaging its window is a box filter (running sums,
+    O(1) per pixel whatever its size); a rank-1 kernel runs as two 1D
+    passes (O(h + w)); large dense kernels go through the FFT; everything
+    else uses filter2D directly.
+    """
+    kernel = np.asarray(kernel, dtype=np.float32)
+    h, w = kernel.shape
+    if kernel.size > 1 and np.all(kernel == kernel.flat[0]) and np.isclose(kernel.flat[0] * kernel.size, 1):
+        return ConvolutionPlan("box", kernel, None, None)
+    factors = separable_factors(kernel) if h > 1 and w > 1 else None
+    if factors is not None:
+        column, row = factors
+        return ConvolutionPlan("separable", kernel, column.astype(np.float32), row.astype(np.float32))
+    if max(h, w) >= FFT_MIN_SIDE:
+        return ConvolutionPlan("fft", kernel, None, None)
+    return ConvolutionPlan("direct", kernel, None, None)
+
+
+def plan_cost(plan):
+    """Rough per-pixel cost in kernel taps, used to decide whether fusing two filters pays off."""
+    h, w = plan.kernel.shape
+    if plan.strategy == "box":
+        return BOX_TAPS
+    if plan.strategy == "separable":
+        return h + w
+    return min(h * w, DFT_TAPS)
+
+
+def fft_filter(image, kernel):
+    """filter2D via the FFT: reflect-101 padding, then a 'valid' FFT convolution per channel."""
+    import cv2
+    from scipy.signal import fftconvolve
+    h, w = kernel.shape
+    # filter2D's default anchor is (w // 2, h // 2), which matters for even-sized kernels
+    top, left = h // 2, w // 2
+    padded = cv2.copyMakeBorder(image, top, h - 1 - top, left, w - 1 - left, cv2.BORDER_REFLECT_101)
+    # Correlation == convolution with the flipped kernel
+    flipped = kernel[::-1, ::-1].astype(np.float32)
+    if padded.ndim == 3:
+        flipped = flipped[:, :, None]
+    result = fftconvolve(padded.astype(np.float32), flipped, mode="valid", axes=(0, 1))
+    if np.issubdtype(image.dtype, np.integer):
+        info = np.iinfo(image.dtype)
+        result = np.clip(np.rint(result), info.min, info.max)
+    return result.astype(image.dtype)
+
+
+def convolve(image, kernel, plan=None):
+    """Applies `kernel` like cv2.filter2D, using the strategy from `plan` (planned here if None)."""
+    import cv2
+    plan = plan or plan_convolution(kernel)
+    if plan.strategy == "box":
+        h, w = plan.kernel.shape
+        return cv2.blur(image, (w, h), borderType=cv2.BORDER_REFLECT_101)
+    if plan.strategy == "separable":
+        return cv2.sepFilter2D(image, -1, plan.row, plan.column)
+    if plan.strategy == "fft":
+        return fft_filter(image, plan.kernel)
+    return cv2.filter2D(image, -1, plan.kernel)
+
+
+def gaussian_kernel(sigma):
+    """Normalized 2D Gaussian kernel covering +-3 sigma (odd size, at least 3)."""
+    import cv2
+    size = max(3, 2 * int(np.ceil(3 * sigma)) + 1)
+    column = cv2.getGaussianKernel(size, sigma, cv2.CV_64F)
+    return (column @ column.T).astype(np.float32)
@@ -0,0 +1,174 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+import pandas as pd
+
+from columnar_io import PROJECTED_TYPES, file_kind, read_upload, read_path, read_schema
+
+# ==========================================
+# DATASET CACHE (CONTENT-HASH KEYED, LRU)
+# ==========================================
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB in-memory budget
+
+
+def hash_bytes(data):
+    """Returns a stable content hash for raw upload bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def frame_nbytes(df):
+    """Approximate in-memory size of a DataFrame (including object columns)."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class DatasetCache:
+    """LRU cache of parsed DataFrames bounded by a byte budget.
+
+    Entries evicted from memory are optionally spilled to a local Parquet
+    (or Feather) file in `spill_dir` and re-loaded on the next lookup.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, spill_dir=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._entries = OrderedDict()  # key -> (df, nbytes)
+        self._spilled = {}  # key -> path
+        self._schemas = {}  # content hash -> DatasetSchema
+        self._upload_hashes = {}  # Streamlit upload file_id -> content hash
+        self.total_bytes = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __contains__(self, key):
+        return key in self._entries or key in self._spilled
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Returns the cached DataFrame (not a copy) or None."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+        if key in self._spilled:
+            path = self._spilled.pop(key)
+            df = self._load_spilled(path)
+            # Back in memory: the file is rewritten if the entry is evicted again
+            self._remove_file(path)
+            if df is not None:
+                self.put(key, df)
+                return df
+        return None
+
+    def put(self, key, df):
+        """Stores a DataFrame and evicts least-recently-used entries over budget."""
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        nbytes = frame_nbytes(df)
+        self._entries[key] = (df, nbytes)
+        self.total_bytes += nbytes
+        self._evict()
+        return df
+
+    def clear(self):
+        for path in self._spilled.values():
+            self._remove_file(path)
+        self._entries.clear()
+        self._spilled.clear()
+        self._schemas.clear()
+        self.total_bytes = 0
+
+    def upload_key(self, uploaded_file):
+        """Content hash of an upload, computed once per uploaded file rather than per rerun."""
+        file_id = getattr(uploaded_file, "file_id", None)
+        if file_id is not None and file_id in self._upload_hashes:
+            return self._upload_hashes[file_id]
+        key = hash_bytes(uploaded_file.getvalue())
+        if file_id is not None:
+            self._upload_hashes[file_id] = key
+        return key
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, (df, nbytes) = self._entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self._spill(key, df)
+
+    def _spill(self, key, df):
+        if not self.spill_dir:
+            return
+        # Keys contain column names ("hash:Q1/2023 score"), so the file name is a hash of the key
+        base = os.path.join(self.spill_dir, hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+        try:
+            df.to_parquet(base + ".parquet")
+            self._spilled[key] = base + ".parquet"
+            return
+        except (ImportError, ValueError, OSError):
+            pass
+        try:
+            # Feather requires a default RangeIndex
+            df.reset_index(drop=True).to_feather(base + ".feather")
+            self._spilled[key] = base + ".feather"
+        except (ImportError, ValueError, OSError):
+            pass
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _load_spilled(self, path):
+        try:
+            # Memory-mapped read of the spilled Parquet/Feather file
+            return read_path(path)
+        except (ImportError, OSError):
+            return None
+
+
+def load_cached_schema(uploaded_file, cache):
+    """Phase 1 of the two-phase load: header/schema only. Returns (key, DatasetSchema)."""
+    key = cache.upload_key(uploaded_file)
+    if key not in cache._schemas:
+        cache._schemas[key] = read_schema(uploaded_file.name, uploaded_file.getvalue())
+    return key, cache._schemas[key]
+
+
+def load_cached_columns(uploaded_file, cache, columns):
+    """Phase 2: materialises only `columns`, caching each column separately.
+
+    Columns already loaded by an earlier selection are reused. Parquet/Arrow
+    read just the missing columns; CSV/Excel have no real projection (usecols
+    still parses the whole file), so one full parse fills the cache for every
+    column. Pass all the columns a step needs in one call. The assembled
+    frame is cached per column selection too, so a rerun with the same
+    selection returns it without copying (callers must not modify it in place).
+    """
+    key = cache.upload_key(uploaded_file)
+    columns = list(dict.fromkeys(columns))
+    if not columns:
+        return pd.DataFrame()
+    # "|" keeps selection keys apart from the per-column "hash:column" keys
+    selection_key = f"{key}|" + "\x1f".join(columns)
+    frame = cache.get(selection_key)
+    if frame is not None:
+        return frame
+    parts = {col: cache.get(f"{key}:{col}") for col in columns}
+    missing = [col for col, part in parts.items() if part is None]
+    if missing:
+        if file_kind(uploaded_file.name) in PROJECTED_TYPES:
+            loaded = read_upload(uploaded_file.name, uploaded_file.getvalue(), columns=missing)
+        else:
+            loaded = read_upload(uploaded_file.name, uploaded_file.getvalue())
+            # Cache the unrequested columns first so the requested ones are the most recent
+            for col in loaded.columns:
+                if col not in parts and f"{key}:{col}" not in cache:
+                    cache.put(f"{key}:{col}", loaded[[col]])
+        for col in missing:
+            parts[col] = cache.put(f"{key}:{col}", loaded[[col]])
+    if len(columns) == 1:
+        return parts[columns[0]]
+    return cache.put(selection_key, pd.concat([parts[col] for col in columns], axis=1))
@@ -0,0 +1,76 @@
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+# ==========================================
+# IMAGE CACHES (DECODED UPLOADS + TRANSFORM RESULTS, LRU)
+# ==========================================
+DECODED_MAX_BYTES = 512 * 1024 * 1024
+RESULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def hash_bytes(data):
+    """Returns a stable content hash for raw upload bytes."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def array_key(array):
+    """Hash of a matrix/kernel's values, so equal parameters map to the same cache entry."""
+    array = np.ascontiguousarray(array, dtype=np.float64)
+    return hashlib.blake2b(str(array.shape).encode() + array.tobytes(), digest_size=16).hexdigest()
+
+
+class ImageCache:
+    """LRU cache of image arrays bounded by a byte budget.
+
+    Cached arrays are marked read-only, since the same object is handed out
+    on every hit.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._upload_hashes = {}  # Streamlit upload file_id -> content hash
+        self.total_bytes = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        image = self._entries.get(key)
+        if image is not None:
+            self._entries.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key).nbytes
+        image.setflags(write=False)
+        self._entries[key] = image
+        self.total_bytes += image.nbytes
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.total_bytes -= old.nbytes
+        return image
+
+    def get_or_compute(self, key, compute):
+        """Returns the cached array for `key`, calling `compute()` only on a miss."""
+        image = self.get(key)
+        if image is None:
+            image = self.put(key, compute())
+        return image
+
+    def upload_key(self, uploaded_file):
+        """Content hash of an upload, computed once per uploaded file rather than per rerun."""
+        file_id = getattr(uploaded_file, "file_id", None)
+        if file_id is not None and file_id in self._upload_hashes:
+            return self._upload_hashes[file_id]
+        key = hash_bytes(uploaded_file.getvalue())
+        if file_id is not None:
+            self._upload_hashes[file_id] = key
+        return key
@@ -0,0 +1,53 @@
+import io
+
+import numpy as np
+
+# ==========================================
+# PREVIEW PYRAMID (INTERACTIVE PROXY + FULL-RESOLUTION EXPORT)
+# ==========================================
+PREVIEW_MAX_SIDE = 1600  # Long side of the preview level (about a wide column on a HiDPI screen)
+
+
+def build_pyramid(image, max_side=PREVIEW_MAX_SIDE):
+    """Halves the image (area averaging) until its long side fits `max_side`.
+
+    Returns the levels from full resolution down; the last one is the
+    preview level used for interactive edits.
+    """
+    import cv2
+    levels = [image]
+    while max(levels[-1].shape[:2]) > max_side:
+        h, w = levels[-1].shape[:2]
+        levels.append(cv2.resize(levels[-1], ((w + 1) // 2, (h + 1) // 2), interpolation=cv2.INTER_AREA))
+    return levels
+
+
+def level_scale(full_shape, level_shape):
+    """Per-axis (sx, sy) factors from full-resolution pixels to level pixels."""
+    return level_shape[1] / full_shape[1], level_shape[0] / full_shape[0]
+
+
+def matrix_for_level(matrix, full_shape, level_shape):
+    """Re-expresses a full-resolution 3x3 transform in the pixel grid of a pyramid level.
+
+    S @ M @ S^-1, where S maps full-resolution pixel centres to level pixel
+    centres (x_l = (x + 0.5) * sx - 0.5): translations, reflection widths and
+    rotation centres are scaled, while pure scale/rotation parts stay as
+    they are.
+    """
+    sx, sy = level_scale(full_shape, level_shape)
+    s = np.array([[sx, 0, 0.5 * sx - 0.5], [0, sy, 0.5 * sy - 0.5], [0, 0, 1]])
+    return (s @ np.asarray(matrix, dtype=np.float64) @ np.linalg.inv(s)).astype(np.float32)
+
+
+def box_size_for_level(k_size, scale):
+    """Odd box-blur size covering the same physical extent on a level (1 = no blur)."""
+    return max(1, 2 * int(round((k_size * scale - 1) / 2)) + 1)
+
+
+def encode_png(image):
+    """PNG bytes of an RGB/RGBA/grayscale array for the full-resolution download."""
+    from PIL import Image
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,105 @@
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from convolution import SEPARABLE_TOLERANCE, plan_convolution
+from image_cache import array_key
+
+# ==========================================
+# KERNEL BANK (NAMED KERNELS + PRECOMPUTED METADATA)
+# ==========================================
+MAX_ANALYSES = 256  # Unsaved kernels (edits, fused chain kernels) whose analysis is kept
+
+BUILTIN_KERNELS = {
+    "Identity": [[0, 0, 0], [0, 1, 0], [0, 0, 0]],
+    "Sobel X": [[-1, 0, 1], [-2, 0, 2], [-1, 0, 1]],
+    "Sobel Y": [[-1, -2, -1], [0, 0, 0], [1, 2, 1]],
+    "Prewitt X": [[-1, 0, 1], [-1, 0, 1], [-1, 0, 1]],
+    "Prewitt Y": [[-1, -1, -1], [0, 0, 0], [1, 1, 1]],
+    "Laplacian": [[0, 1, 0], [1, -4, 1], [0, 1, 0]],
+    "Laplacian (8-neighbour)": [[1, 1, 1], [1, -8, 1], [1, 1, 1]],
+}
+
+# rank: numerical rank (1 = separable); total: sum of weights; normalized: sums to 1 (keeps
+# brightness); zero_sum: edge/derivative kernel; plan: the ConvolutionPlan used to apply it
+KernelInfo = namedtuple("KernelInfo", ["kernel", "rank", "total", "normalized", "zero_sum", "plan"])
+
+
+def analyze_kernel(kernel):
+    """Computes a kernel's metadata and execution plan (SVD rank, normalization, strategy)."""
+    kernel = np.asarray(kernel, dtype=np.float32)
+    singular = np.linalg.svd(kernel.astype(np.float64), compute_uv=False)
+    rank = int((singular > SEPARABLE_TOLERANCE * singular[0]).sum()) if singular[0] > 0 else 0
+    total = float(kernel.sum())
+    magnitude = float(np.abs(kernel).sum()) or 1.0
+    return KernelInfo(kernel, rank, total, abs(total - 1) <= 1e-6, abs(total) <= 1e-6 * magnitude,
+                      plan_convolution(kernel))
+
+
+def resize_kernel(kernel, size):
+    """Centre-crops or zero-pads a kernel to size x size (odd), keeping its anchor in the middle."""
+    kernel = np.asarray(kernel, dtype=np.float32)
+    out = np.zeros((size, size), dtype=np.float32)
+    h, w = kernel.shape
+    # Offsets of the overlapping window in the source and the destination
+    sh, dh = max(0, (h - size) // 2), max(0, (size - h) // 2)
+    sw, dw = max(0, (w - size) // 2), max(0, (size - w) // 2)
+    n_h, n_w = min(h, size), min(w, size)
+    out[dh:dh + n_h, dw:dw + n_w] = kernel[sh:sh + n_h, sw:sw + n_w]
+    return out
+
+
+class KernelBank:
+    """Named kernels plus an analysis cache keyed by kernel values.
+
+    Every kernel is analysed once, when it is first saved or applied; reruns
+    and chain passes with the same values reuse its KernelInfo and plan.
+    """
+
+    def __init__(self):
+        self._named = OrderedDict()  # name -> array_key of the kernel
+        self._info = OrderedDict()  # array_key -> KernelInfo (LRU for unsaved kernels)
+        for name, kernel in BUILTIN_KERNELS.items():
+            self._named[name] = array_key(self.info(kernel).kernel)
+
+    def names(self):
+        return list(self._named)
+
+    def is_builtin(self, name):
+        return name in BUILTIN_KERNELS
+
+    def get(self, name):
+        return self._info[self._named[name]]
+
+    def info(self, kernel):
+        """KernelInfo for `kernel`, analysed only the first time these values are seen."""
+        kernel = np.asarray(kernel, dtype=np.float32)
+        key = array_key(kernel)
+        info = self._info.get(key)
+        if info is None:
+            info = self._info[key] = analyze_kernel(kernel)
+            self._evict()
+        else:
+            self._info.move_to_end(key)
+        return info
+
+    def plan_for(self, kernel):
+        return self.info(kernel).plan
+
+    def save(self, name, kernel):
+        """Saves `kernel` under `name`; built-in names cannot be overwritten (ValueError)."""
+        if self.is_builtin(name):
+            raise ValueError(f"'{name}' is a built-in kernel")
+        info = self.info(kernel)
+        self._named[name] = array_key(info.kernel)
+        return info
+
+    def remove(self, name):
+        if not self.is_builtin(name):
+            self._named.pop(name, None)
+
+    def _evict(self):
+        saved = set(self._named.values())
+        unsaved = [key for key in self._info if key not in saved]
+        for key in unsaved[:max(0, len(unsaved) - MAX_ANALYSES)]:
+            del self._info[key]
@@ -0,0 +1,97 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+# ==========================================
+# PDF REPORT (IN-MEMORY, fpdf2)
+# ==========================================
+PLOT_WIDTH = 150
+
+
+def latin1_safe(text):
+    """Core PDF fonts are latin-1 only: replace anything outside it."""
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+class PDFReport(FPDF):
+    def header(self):
+        self.set_font('Helvetica', 'B', 14)
+        self.cell(0, 10, 'Statistical Analysis Report', border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.ln(5)
+    def footer(self):
+        self.set_y(-15)
+        self.set_font('Helvetica', 'I', 8)
+        self.cell(0, 10, f'Page {self.page_no()}', border=0, align='C')
+    def chapter_title(self, title):
+        self.set_font('Helvetica', 'B', 12)
+        self.set_fill_color(220, 220, 220)
+        self.cell(0, 10, latin1_safe(title), border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='L', fill=True)
+        self.ln(4)
+    def chapter_subtitle(self, title):
+        self.set_font('Helvetica', 'B', 11)
+        self.cell(0, 10, latin1_safe(title), border=0, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    def chapter_body(self, body):
+        self.set_font('Helvetica', '', 11)
+        self.multi_cell(0, 5, latin1_safe(body))
+        self.ln()
+    def plot_image(self, png, w=PLOT_WIDTH):
+        """Places PNG bytes straight from memory (no temp file)."""
+        if self.get_y() > 200: self.add_page()
+        self.image(io.BytesIO(png), w=w)
+        self.ln(10)
+
+
+def build_report_pdf(report_content, render_png):
+    """Builds the report and returns the PDF bytes.
+
+    `report_content` holds ("header"|"subheader"|"text", str) items and
+    ("plot", key, builder) items; `render_png(key, builder)` returns PNG
+    bytes, normally from the plot cache so figures shown on the page are
+    not rasterized a second time.
+    """
+    pdf = PDFReport()
+    pdf.add_page()
+    for item in report_content:
+        item_type, content = item[0], item[1]
+        if item_type == "header": pdf.chapter_title(content)
+        elif item_type == "subheader": pdf.chapter_subtitle(content)
+        elif item_type == "text": pdf.chapter_body(content)
+        elif item_type == "plot": pdf.plot_image(render_png(content, item[2]))
+    # fpdf2 already returns bytes: no latin-1 re-encoding of the whole document
+    return bytes(pdf.output())
+
+
+class ReportJobs:
+    """Builds PDFs on a background thread, keyed by the analysis inputs.
+
+    The first request for a key starts the build; later requests for the
+    same key share the running build or its finished bytes. Only the most
+    recent `max_entries` reports are kept.
+    """
+
+    def __init__(self, max_workers=1, max_entries=8):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-report")
+        self._futures = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def submit(self, key, fn, *args):
+        """Returns the Future for `key`, starting `fn(*args)` if none exists yet."""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or (future.done() and future.exception() is not None):
+                future = self._executor.submit(fn, *args)
+                self._futures[key] = future
+            self._futures.move_to_end(key)
+            while len(self._futures) > self.max_entries:
+                self._futures.popitem(last=False)
+            return future
+
+    def result(self, key, fn, *args, timeout=None):
+        """Blocks until the report for `key` is built and returns its bytes."""
+        return self.submit(key, fn, *args).result(timeout=timeout)
+
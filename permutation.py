@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from stats_engine import DENSE_MAX_CELLS, contingency_cells
+
+# ==========================================
+# PERMUTATION TESTS (BATCHED, EARLY STOPPING)
+# ==========================================
+MAX_PERMUTATIONS = 10_000
+BATCH_SIZE = 250  # Permutations drawn and evaluated together
+ROUND_BATCHES = 4  # Batches run in parallel between early-stopping checks
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024  # Working-set budget for permutation blocks (all workers)
+STOP_CONFIDENCE = 0.99  # Clopper-Pearson level used to decide p < alpha or p > alpha
+PERMUTATION_SEED = 0
+
+
+def _p_bounds(hits, done, confidence=STOP_CONFIDENCE):
+    """Clopper-Pearson interval for the permutation p-value after `done` permutations."""
+    from scipy.stats import beta
+    tail = (1 - confidence) / 2
+    low = beta.ppf(tail, hits, done - hits + 1) if hits > 0 else 0.0
+    high = beta.ppf(1 - tail, hits + 1, done - hits) if hits < done else 1.0
+    return low, high
+
+
+def _index_dtype(n):
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def _permutation_indices(rng, size, n):
+    return rng.permuted(np.broadcast_to(np.arange(n, dtype=_index_dtype(n)), (size, n)), axis=1)
+
+
+def _round_plan(row_bytes, batch_size, workers, memory_bytes):
+    """(workers, rows per batch_stat call) so that all concurrently live blocks fit the budget.
+
+    When a single permutation already needs more than a worker's share of
+    the budget, fewer workers run instead of each one overshooting it.
+    """
+    row_bytes = max(1, int(row_bytes))
+    workers = int(max(1, min(workers, ROUND_BATCHES, memory_bytes // row_bytes)))
+    rows = int(np.clip(memory_bytes // (row_bytes * workers), 1, batch_size))
+    return workers, rows
+
+
+def run_permutations(batch_stat, observed, alpha=0.05, max_perms=MAX_PERMUTATIONS, batch_size=BATCH_SIZE,
+                     seed=PERMUTATION_SEED, row_bytes=0, memory_bytes=DEFAULT_MEMORY_BYTES, max_workers=None):
+    """Counts permuted statistics >= `observed` in batches until the p-value is decided.
+
+    `batch_stat(rng, size)` returns `size` permuted statistics and holds
+    about `row_bytes` of working memory per permutation. Batches run up to
+    ROUND_BATCHES at a time on a thread pool and each has its own child seed;
+    a batch is evaluated in slices sized from `memory_bytes`, its generator
+    continuing from one slice to the next. After every round the run stops
+    once the p-value's confidence interval lies entirely below or above
+    `alpha`. Stopping points are fixed rounds, so the result depends only on
+    `seed`, not on the memory budget or the number of workers.
+    Returns (p_value, permutations_used).
+    """
+    sizes = [batch_size] * (max_perms // batch_size) + ([max_perms % batch_size] if max_perms % batch_size else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers, rows = _round_plan(row_bytes, batch_size, max_workers or os.cpu_count() or 1, memory_bytes)
+    tolerance = 1e-12 * max(1.0, abs(observed))
+    hits = done = 0
+
+    def run(k):
+        rng = np.random.default_rng(seeds[k])
+        return np.concatenate([batch_stat(rng, min(rows, sizes[k] - start)) for start in range(0, sizes[k], rows)])
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(sizes), ROUND_BATCHES):
+            for stats_b in pool.map(run, range(start, min(start + ROUND_BATCHES, len(sizes)))):
+                hits += int((stats_b >= observed - tolerance).sum())
+                done += stats_b.size
+            low, high = _p_bounds(hits, done)
+            if high < alpha or low > alpha:
+                break
+    return (hits + 1) / (done + 1), done
+
+
+def permutation_correlation(x, y, method="pearson", alpha=0.05, **kwargs):
+    """Two-sided permutation p-value for Pearson or Spearman r.
+
+    Ranks (Spearman) and the standardized vectors are computed once; each
+    batch then gathers one permuted copy per row and takes a single
+    matrix-vector product, so r for the whole batch is one BLAS call.
+    Returns (p_value, permutations_used); (nan, 0) when x or y is constant.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if method == "spearman":
+        from scipy.stats import rankdata
+        x, y = rankdata(x), rankdata(y)
+    zx, zy = x - x.mean(), y - y.mean()
+    ssx, ssy = float(zx @ zx), float(zy @ zy)
+    if not (ssx > 0 and ssy > 0):
+        return np.nan, 0
+    zx /= np.sqrt(ssx)
+    zy /= np.sqrt(ssy)
+    observed = abs(float(zx @ zy))
+
+    def batch_stat(rng, size):
+        return np.abs(np.take(zx, _permutation_indices(rng, size, zx.size)) @ zy)
+
+    # Permuted indices + gathered float64 copy
+    row_bytes = zx.size * (np.dtype(_index_dtype(zx.size)).itemsize + 8)
+    return run_permutations(batch_stat, observed, alpha=alpha, row_bytes=row_bytes, **kwargs)
+
+
+def permutation_chi_square(codes_x, codes_y, alpha=0.05, **kwargs):
+    """Permutation p-value for the chi-square statistic of two factorized columns (-1 = missing).
+
+    Permuting Y keeps both margins, so 1/E is computed once. Small tables
+    count a whole batch with one bincount over (permutation, cell) codes;
+    high-cardinality tables count the occupied cells of each permutation.
+    Returns (p_value, permutations_used); (nan, 0) for a table with a single
+    row or column, where there is nothing to test.
+    """
+    keep = (codes_x >= 0) & (codes_y >= 0)
+    _, cx = np.unique(codes_x[keep], return_inverse=True)
+    _, cy = np.unique(codes_y[keep], return_inverse=True)
+    if cx.size == 0 or cx.max() == 0 or cy.max() == 0:
+        return np.nan, 0
+    n_x, n_y, n = int(cx.max()) + 1, int(cy.max()) + 1, cx.size
+    row_tot = np.bincount(cx, minlength=n_x).astype(np.float64)
+    col_tot = np.bincount(cy, minlength=n_y).astype(np.float64)
+
+    def chi2_cells(rows, cols, counts):
+        return float((counts * counts * n / (row_tot[rows] * col_tot[cols])).sum() - n)
+
+    observed = chi2_cells(*contingency_cells(cx, cy, n_x, n_y))
+    cells = n_x * n_y
+    if cells <= DENSE_MAX_CELLS:
+        # Permuted indices + gathered codes + flat cell codes, and the int64 table with its float64 square
+        row_bytes = n * (np.dtype(_index_dtype(n)).itemsize + 16) + cells * 24
+        inv_expected = (n / np.outer(row_tot, col_tot)).ravel()
+        per_batch = max(1, DENSE_MAX_CELLS // cells)
+        base = cx.astype(np.int64) * n_y
+
+        def batch_stat(rng, size):
+            out = []
+            for start in range(0, size, per_batch):
+                m = min(per_batch, size - start)
+                flat = np.take(cy, _permutation_indices(rng, m, n)) + base + (np.arange(m) * cells)[:, None]
+                tables = np.bincount(flat.ravel(), minlength=m * cells).reshape(m, cells)
+                out.append((tables.astype(np.float64) ** 2) @ inv_expected - n)
+            return np.concatenate(out)
+    else:
+        # One permutation at a time: the permuted copy plus the combined cell codes
+        row_bytes = n * 16
+
+        def batch_stat(rng, size):
+            return np.array([chi2_cells(*contingency_cells(cx, rng.permutation(cy), n_x, n_y))
+                             for _ in range(size)])
+
+    return run_permutations(batch_stat, observed, alpha=alpha, row_bytes=row_bytes, **kwargs)
@@ -0,0 +1,77 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ==========================================
+# PLOT CACHE (RASTERIZED PNG BYTES, LRU)
+# ==========================================
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+PLOT_DPI = 100
+
+# pyplot keeps global state, so figures are built one at a time across threads
+# (the page script and background report builds)
+_RENDER_LOCK = threading.Lock()
+
+
+def data_hash(*series):
+    """Content hash of one or more Series, used to key cached plots."""
+    h = hashlib.blake2b(digest_size=16)
+    for s in series:
+        h.update(str(s.name).encode())
+        h.update(pd.util.hash_pandas_object(s, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def figure_to_png(fig, dpi=PLOT_DPI):
+    """Rasterizes a figure to PNG bytes and closes it so matplotlib frees it."""
+    import matplotlib.pyplot as plt
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=dpi)
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+class PlotCache:
+    """LRU cache of PNG bytes keyed by (column, plot type, data hash)."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= len(self._entries.pop(key))
+            self._entries[key] = png
+            self.total_bytes += len(png)
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, old = self._entries.popitem(last=False)
+                self.total_bytes -= len(old)
+            return png
+
+    def render(self, key, builder):
+        """Returns cached PNG bytes for `key`, calling `builder()` -> Figure only on a miss."""
+        png = self.get(key)
+        if png is None:
+            with _RENDER_LOCK:
+                png = self.get(key)
+                if png is None:
+                    png = self.put(key, figure_to_png(builder()))
+        return png
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# RELIABILITY (CRONBACH'S ALPHA) FROM ONE COVARIANCE MATRIX
+# ==========================================
+CHUNK_ROWS = 65_536  # Rows converted to float64 at a time (bounds memory for millions of respondents)
+ITEM_COLUMNS = ["Item", "Mean", "Std", "Corrected Item-Total r", "Alpha if Deleted"]
+
+
+def _chunks(df, items, chunk_rows):
+    """Yields complete-case (listwise) float64 row blocks of the item columns."""
+    for start in range(0, len(df), chunk_rows):
+        block = df.iloc[start:start + chunk_rows][items].to_numpy(dtype=np.float64, na_value=np.nan)
+        complete = ~np.isnan(block.sum(axis=1))
+        yield block if complete.all() else block[complete]
+
+
+def item_covariance(df, items, chunk_rows=CHUNK_ROWS):
+    """Sample covariance matrix of the items over complete cases, in two chunked passes.
+
+    Returns (cov, means, mins, maxs, n). The second pass accumulates centered
+    cross-products, which stays accurate for large means.
+    """
+    k = len(items)
+    n, sums = 0, np.zeros(k)
+    mins, maxs = np.full(k, np.inf), np.full(k, -np.inf)
+    for block in _chunks(df, items, chunk_rows):
+        if not len(block): continue
+        n += len(block)
+        sums += block.sum(axis=0)
+        np.minimum(mins, block.min(axis=0), out=mins)
+        np.maximum(maxs, block.max(axis=0), out=maxs)
+    means = sums / n if n else np.full(k, np.nan)
+
+    cross = np.zeros((k, k))
+    for block in _chunks(df, items, chunk_rows):
+        # The block may be a read-only view of the frame (pandas copy-on-write), so never in place
+        block = block - means
+        cross += block.T @ block
+    cov = cross / (n - 1) if n > 1 else np.full((k, k), np.nan)
+    return cov, means, mins, maxs, n
+
+
+def alpha_from_covariance(cov):
+    """Cronbach's alpha, alpha-if-item-deleted and corrected item-total r from one covariance matrix.
+
+    With S = sum(cov), rowsum_i and c_ii, removing item i leaves a total
+    variance of S - 2 rowsum_i + c_ii, so all k deletions cost O(k^2).
+    """
+    k = cov.shape[0]
+    item_var = np.diag(cov)
+    row_sums = cov.sum(axis=1)
+    total_var = row_sums.sum()
+    trace = item_var.sum()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        alpha = k / (k - 1) * (1 - trace / total_var) if k > 1 else np.nan
+        rest_var = total_var - 2 * row_sums + item_var  # Var(total - item_i)
+        if k > 2:
+            alpha_deleted = (k - 1) / (k - 2) * (1 - (trace - item_var) / rest_var)
+        else:
+            alpha_deleted = np.full(k, np.nan)
+        item_total_r = (row_sums - item_var) / np.sqrt(item_var * rest_var)
+    return alpha, alpha_deleted, item_total_r
+
+
+def reliability_analysis(df, items, reverse=(), chunk_rows=CHUNK_ROWS):
+    """Cronbach's alpha (raw and standardized) plus the per-item table for a composite.
+
+    Reverse-coded items (scored min + max - x) only flip the sign of their
+    covariances, so they are handled on the matrix rather than the data.
+    Returns (summary dict, item DataFrame with ITEM_COLUMNS).
+    """
+    items = list(dict.fromkeys(items))
+    cov, means, mins, maxs, n = item_covariance(df, items, chunk_rows)
+    flip = np.array([-1.0 if item in reverse else 1.0 for item in items])
+    cov = cov * np.outer(flip, flip)
+    means = np.where(flip < 0, mins + maxs - means, means)
+
+    alpha, alpha_deleted, item_total_r = alpha_from_covariance(cov)
+    k = len(items)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(std, std)
+        mean_r = (corr.sum() - k) / (k * (k - 1)) if k > 1 else np.nan
+        alpha_std = k * mean_r / (1 + (k - 1) * mean_r)
+
+    summary = {
+        "Cronbach's Alpha": alpha,
+        "Standardized Alpha": alpha_std,
+        "Mean Inter-Item r": mean_r,
+        "Items": k,
+        "N": n,
+    }
+    table = pd.DataFrame({
+        "Item": items,
+        "Mean": means,
+        "Std": std,
+        "Corrected Item-Total r": item_total_r,
+        "Alpha if Deleted": alpha_deleted,
+    }, columns=ITEM_COLUMNS)
+    return summary, table
@@ -0,0 +1,265 @@
+"""Headless batch runner for the statistics pipeline.
+
+Runs the same descriptive + association analysis as the Streamlit tools
+page over many files, in parallel worker processes, without importing
+Streamlit. Charts (seaborn) and PDFs (fpdf) are only loaded with --pdf.
+
+Examples:
+    python stats_cli.py survey_*.csv --pair X_Total Y_Total \
+        --items-x q1,q2,q3 --items-y q4,q5,q6 --out results/
+    python stats_cli.py a.parquet b.xlsx --pair age income --pair gender region \
+        --format parquet --pdf --workers 8
+    python stats_cli.py huge.csv --stream --columns age,income,region
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+def load_table(path, columns=None):
+    """Reads a CSV/Excel/Parquet/Feather/Arrow file (optionally only `columns`)."""
+    from columnar_io import read_path
+    return read_path(path, columns=columns)
+
+
+def _json_value(v):
+    """Converts numpy scalars / NaN to JSON-friendly values."""
+    try:
+        v = v.item()
+    except AttributeError:
+        pass
+    if isinstance(v, float) and v != v:
+        return None
+    return v
+
+
+def analyze_file(path, pairs, items_x=None, items_y=None, normality="auto", pdf_dir=None,
+                 composite_method="sum", reverse=(), bootstrap=False, permutation=False, output_name=None):
+    """Runs the full analysis for one file and returns a JSON-serialisable result dict."""
+    import pandas as pd
+    from composites import composite_score
+    from reliability import reliability_analysis
+    from stats_engine import get_descriptive_stats, association_summary
+
+    needed = {c for pair in pairs for c in pair} - {"X_Total", "Y_Total"}
+    needed |= set(items_x or []) | set(items_y or [])
+    df = load_table(path, columns=sorted(needed) if needed else None)
+    if items_x: df["X_Total"] = composite_score(df, items_x, reverse=reverse, method=composite_method)
+    if items_y: df["Y_Total"] = composite_score(df, items_y, reverse=reverse, method=composite_method)
+
+    columns = list(dict.fromkeys(c for pair in pairs for c in pair))
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+    descriptive = get_descriptive_stats(df, numeric)
+    if bootstrap:
+        from bootstrap import descriptive_cis
+        descriptive = {c: {**s, **descriptive_cis(df[c])} for c, s in descriptive.items()}
+    frequencies = {
+        c: {str(k): int(v) for k, v in df[c].value_counts().head(20).items()}
+        for c in columns if c not in descriptive
+    }
+
+    summaries, associations = [], []
+    for col_x, col_y in pairs:
+        summary = association_summary(df, col_x, col_y, normality=normality, bootstrap=bootstrap,
+                                      permutation=permutation)
+        summaries.append(summary)
+        associations.append({"x": col_x, "y": col_y,
+                             **{k: _json_value(v) for k, v in summary.items() if k != "contingency"}})
+
+    result = {
+        "file": path,
+        "rows": int(len(df)),
+        "descriptive": {c: {k: _json_value(v) for k, v in s.items()} for c, s in descriptive.items()},
+        "frequencies": frequencies,
+        "associations": associations,
+    }
+    reliability = {}
+    for name, items in (("X_Total", items_x), ("Y_Total", items_y)):
+        if items:
+            summary, table = reliability_analysis(df, items, reverse=reverse)
+            reliability[name] = {
+                **{k: _json_value(v) for k, v in summary.items()},
+                "items": [{k: _json_value(v) for k, v in row.items()} for row in table.to_dict("records")],
+            }
+    if reliability:
+        result["reliability"] = reliability
+    if pdf_dir:
+        result["pdf"] = write_pdf(df, result, pairs, summaries, pdf_dir, output_name)
+    return result
+
+
+def stream_file(path, columns=None, chunksize=None):
+    """Descriptive statistics for a CSV read from disk in chunks (files larger than RAM)."""
+    from columnar_io import CSV_TYPES, file_kind
+    from streaming_stats import DEFAULT_CHUNKSIZE, stream_descriptive_stats
+    if file_kind(path) not in CSV_TYPES:
+        raise ValueError("--stream reads CSV files only")
+    descriptive, frequencies = stream_descriptive_stats(path, columns=columns, chunksize=chunksize or DEFAULT_CHUNKSIZE)
+    return {
+        "file": path,
+        "streamed": True,
+        "descriptive": {c: {k: _json_value(v) for k, v in s.items()} for c, s in descriptive.items()},
+        "frequencies": {c: {str(k): int(v) for k, v in freq.head(20).items()} for c, freq in frequencies.items()},
+        "associations": [],
+    }
+
+
+def output_names(paths):
+    """Unique output base names: each input's path relative to the inputs' common directory.
+
+    a/survey.csv, b/survey.csv and a/survey.parquet become a__survey.csv,
+    b__survey.csv and a__survey.parquet, so no result overwrites another.
+    """
+    absolute = [os.path.abspath(path) for path in paths]
+    root = os.path.commonpath([os.path.dirname(path) for path in absolute])
+    names, seen = [], {}
+    for path in absolute:
+        name = os.path.relpath(path, root).replace(os.sep, "__")
+        seen[name] = seen.get(name, 0) + 1
+        # The same file listed twice still gets its own output
+        names.append(name if seen[name] == 1 else f"{name}-{seen[name]}")
+    return names
+
+
+def write_pdf(df, result, pairs, summaries, pdf_dir, output_name=None):
+    """Renders the report for one file from its association_summary results (imports seaborn/fpdf only here)."""
+    from pdf_report import build_report_pdf
+    from plot_cache import PlotCache
+    from stats_engine import format_association
+    from stats_plots import build_histogram, build_boxplot, build_association_figure
+
+    report_content = [("header", "Descriptive Statistics")]
+    for col, stats_dict in result["descriptive"].items():
+        report_content.append(("subheader", f"Variable: {col}"))
+        report_content.append(("plot", (col, "histogram"), lambda c=col: build_histogram(df[c], c)))
+        report_content.append(("plot", (col, "boxplot"), lambda c=col: build_boxplot(df[c], c)))
+        report_content.append(("text", ", ".join(
+            f"{k}: {v:.2f}" if v is not None else f"{k}: nan" for k, v in stats_dict.items()
+        )))
+    report_content.append(("header", "Association Analysis"))
+    for (col_x, col_y), summary in zip(pairs, summaries):
+        method, res = format_association(summary)
+        report_content.append(("subheader", f"{col_x} vs {col_y} - Method: {method}"))
+        report_content.append(("text", "\n".join(f"{k}: {v}" for k, v in res.items())))
+        if "Error" not in res:
+            def build(cx=col_x, cy=col_y, m=method, table=summary.get("contingency")):
+                pair = df[[cx, cy]].dropna()
+                return build_association_figure(pair[cx], pair[cy], cx, cy, m, table)
+            report_content.append(("plot", (f"{col_x}|{col_y}", method), build))
+
+    out = os.path.join(pdf_dir, (output_name or os.path.basename(result["file"])) + ".pdf")
+    with open(out, "wb") as fh:
+        fh.write(build_report_pdf(report_content, PlotCache().render))
+    return out
+
+
+def _run_task(task):
+    analyze, path, kwargs = task
+    try:
+        return analyze(path, **kwargs)
+    except Exception as e:
+        return {"file": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def write_outputs(results, out_dir, fmt, names):
+    """Writes one JSON per file (named by `names`), or combined Parquet tables (descriptive + associations)."""
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt == "json":
+        for res, name in zip(results, names):
+            with open(os.path.join(out_dir, name + ".json"), "w", encoding="utf-8") as fh:
+                json.dump(res, fh, indent=2, ensure_ascii=False)
+        return
+    import pandas as pd
+    desc_rows = [
+        {"file": res["file"], "variable": col, **stats_dict}
+        for res in results if "error" not in res
+        for col, stats_dict in res["descriptive"].items()
+    ]
+    assoc_rows = [
+        {"file": res["file"], **assoc}
+        for res in results if "error" not in res
+        for assoc in res["associations"]
+    ]
+    pd.DataFrame(desc_rows).to_parquet(os.path.join(out_dir, "descriptive.parquet"), index=False)
+    pd.DataFrame(assoc_rows).to_parquet(os.path.join(out_dir, "associations.parquet"), index=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch descriptive + association analysis.")
+    parser.add_argument("files", nargs="+", help="Input files (csv, xlsx, parquet, feather, arrow)")
+    parser.add_argument("--pair", nargs=2, action="append", metavar=("X", "Y"),
+                        help="Variables to associate; repeat for several pairs (required unless --stream)")
+    parser.add_argument("--items-x", type=lambda s: s.split(","), help="Comma-separated items summed into X_Total")
+    parser.add_argument("--items-y", type=lambda s: s.split(","), help="Comma-separated items summed into Y_Total")
+    parser.add_argument("--composite-method", default="sum", choices=["sum", "mean"],
+                        help="How items are combined into X_Total / Y_Total")
+    parser.add_argument("--reverse", type=lambda s: s.split(","), default=[],
+                        help="Comma-separated reverse-coded items (scored min + max - value)")
+    parser.add_argument("--normality", default="auto", choices=["auto", "shapiro", "dagostino", "anderson"])
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="Add bootstrap 95%% CIs for the mean, median and correlation r")
+    parser.add_argument("--permutation", action="store_true",
+                        help="Add permutation-test p-values for correlations and Chi-Square")
+    parser.add_argument("--out", default="results", help="Output directory")
+    parser.add_argument("--format", default="json", choices=["json", "parquet"])
+    parser.add_argument("--pdf", action="store_true", help="Also write a PDF report per file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--stream", action="store_true",
+                        help="Read CSVs from disk in chunks: descriptive statistics and frequencies only, "
+                             "approximate median, for files larger than memory")
+    parser.add_argument("--columns", type=lambda s: s.split(","),
+                        help="Comma-separated columns to summarise with --stream (default: all)")
+    parser.add_argument("--chunksize", type=int, help="Rows per chunk with --stream")
+    args = parser.parse_args(argv)
+    if args.stream and (args.pair or args.items_x or args.items_y or args.pdf or args.bootstrap or args.permutation):
+        parser.error("--stream computes descriptive statistics only; drop --pair/--items/--pdf/--bootstrap/--permutation")
+    if not args.stream and not args.pair:
+        parser.error("--pair is required unless --stream is given")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.stream:
+        analyze, kwargs = stream_file, {"columns": args.columns, "chunksize": args.chunksize}
+    else:
+        analyze, kwargs = analyze_file, {
+            "pairs": [tuple(p) for p in args.pair],
+            "items_x": args.items_x,
+            "items_y": args.items_y,
+            "normality": args.normality,
+            "composite_method": args.composite_method,
+            "reverse": args.reverse,
+            "bootstrap": args.bootstrap,
+            "permutation": args.permutation,
+            "pdf_dir": args.out if args.pdf else None,
+        }
+    os.makedirs(args.out, exist_ok=True)
+    names = output_names(args.files)
+    if args.pdf:
+        tasks = [(analyze, path, {**kwargs, "output_name": name}) for path, name in zip(args.files, names)]
+    else:
+        tasks = [(analyze, path, kwargs) for path in args.files]
+
+    results = []
+    if args.workers <= 1 or len(tasks) == 1:
+        results = [_run_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(_run_task, task) for task in tasks]
+            for k, future in enumerate(as_completed(futures), 1):
+                print(f"[{k}/{len(tasks)}] {future.result()['file']}", file=sys.stderr)
+        # Input order (a file listed twice keeps both results)
+        results = [future.result() for future in futures]
+
+    write_outputs(results, args.out, args.format, names)
+    failed = [res for res in results if "error" in res]
+    for res in failed:
+        print(f"ERROR {res['file']}: {res['error']}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
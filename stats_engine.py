@@ -0,0 +1,786 @@
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# FUSED DESCRIPTIVE STATISTICS KERNEL
+# ==========================================
+STAT_KEYS = ("Mean", "Median", "Mode", "Min", "Max", "Std")
+
+
+def _as_matrix(df, columns):
+    """Stacks numeric columns into one (n_cols, n_rows) float64 block with NaN for missing.
+
+    Each column is a contiguous row, so the per-column reductions stream through memory.
+    """
+    block = np.empty((len(columns), len(df)), dtype=np.float64)
+    for j, col in enumerate(columns):
+        block[j] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return block
+
+
+def _mode_of_sorted(values):
+    """Most frequent value of a sorted 1-D array (smallest on ties, like Series.mode()[0])."""
+    if values.size == 0:
+        return np.nan
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    runs = np.diff(np.r_[starts, values.size])
+    return values[starts[np.argmax(runs)]]
+
+
+def describe_columns(df, columns, with_mode=True):
+    """Computes Mean/Median/Mode/Min/Max/Std for many numeric columns in one batched pass.
+
+    Returns {column: stats_dict} with the same keys and conventions as
+    `describe()` (sample std, ddof=1) plus `mode()[0]`. With the mode requested,
+    one column-wise sort yields the median, min, max and mode together;
+    without it the median comes from `np.partition` in linear time.
+    """
+    columns = list(dict.fromkeys(columns))
+    block = _as_matrix(df, columns)
+    valid = ~np.isnan(block)
+    counts = valid.sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.nansum(block, axis=1) / counts
+        centered = block - means[:, None]
+        stds = np.sqrt(np.nansum(centered * centered, axis=1) / (counts - 1))
+    del centered
+    stds[counts < 2] = np.nan
+
+    results = {}
+    if with_mode:
+        # NaNs sort to the end, so the first counts[j] entries of each column are the valid values
+        ordered = np.sort(block, axis=1)
+    for j, col in enumerate(columns):
+        n = counts[j]
+        if n == 0:
+            results[col] = {k: np.nan for k in STAT_KEYS}
+            continue
+        lo, hi = (n - 1) // 2, n // 2
+        if with_mode:
+            values = ordered[j, :n]
+            median = 0.5 * (values[lo] + values[hi])
+            mode, vmin, vmax = _mode_of_sorted(values), values[0], values[-1]
+        else:
+            values = block[j, valid[j]]
+            part = np.partition(values, [lo, hi])
+            median = 0.5 * (part[lo] + part[hi])
+            mode, vmin, vmax = np.nan, values.min(), values.max()
+        results[col] = {
+            "Mean": float(means[j]),
+            "Median": float(median),
+            "Mode": float(mode),
+            "Min": float(vmin),
+            "Max": float(vmax),
+            "Std": float(stds[j])
+        }
+    return results
+
+
+# ==========================================
+# NORMALITY ENGINE
+# ==========================================
+NORMALITY_METHODS = ("auto", "shapiro", "dagostino", "anderson")
+SHAPIRO_MAX_N = 5000  # SciPy: Shapiro-Wilk p-values are unreliable above this size
+NORMALITY_SEED = 0
+
+
+def _central_moments(x):
+    """Mean and 2nd/3rd/4th central moments (biased) from one pass over deviations."""
+    mean = x.mean()
+    d = x - mean
+    d2 = d * d
+    return mean, d2.mean(), (d2 * d).mean(), (d2 * d2).mean()
+
+
+def dagostino_k2(x):
+    """D'Agostino-Pearson K² test from sample moments. Returns (statistic, p_value).
+
+    Same transforms as `scipy.stats.normaltest` (skewtest + kurtosistest), but
+    the moments are gathered once instead of once per component test.
+    """
+    from scipy import stats
+    n = float(x.size)
+    _, m2, m3, m4 = _central_moments(x)
+    if m2 == 0:
+        return np.nan, np.nan
+
+    # Skewness component
+    b1 = m3 / m2 ** 1.5
+    y = b1 * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+    beta2 = (3.0 * (n * n + 27 * n - 70) * (n + 1) * (n + 3)
+             / ((n - 2.0) * (n + 5) * (n + 7) * (n + 9)))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    alpha = np.sqrt(2.0 / (w2 - 1))
+    y = 1.0 if y == 0 else y
+    z_skew = delta * np.log(y / alpha + np.sqrt((y / alpha) ** 2 + 1))
+
+    # Kurtosis component
+    b2 = m4 / (m2 * m2)
+    expected = 3.0 * (n - 1) / (n + 1)
+    var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) * (n + 1.0) * (n + 3) * (n + 5))
+    xk = (b2 - expected) / np.sqrt(var_b2)
+    sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9.0))
+                  * np.sqrt((6.0 * (n + 3) * (n + 5)) / (n * (n - 2) * (n - 3))))
+    a = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / (sqrt_beta1 ** 2)))
+    term1 = 1 - 2 / (9.0 * a)
+    denom = 1 + xk * np.sqrt(2 / (a - 4.0))
+    if denom == 0:
+        return np.nan, np.nan
+    term2 = np.sign(denom) * np.abs((1 - 2.0 / a) / denom) ** (1 / 3.0)
+    z_kurt = (term1 - term2) / np.sqrt(2 / (9.0 * a))
+
+    k2 = z_skew ** 2 + z_kurt ** 2
+    return float(k2), float(stats.chi2.sf(k2, 2))
+
+
+def anderson_darling(x):
+    """Anderson-Darling test for normality with estimated mean/std. Returns (A², p_value).
+
+    The p-value uses the D'Agostino & Stephens (1986) approximation for the
+    small-sample-adjusted statistic.
+    """
+    from scipy import stats
+    n = x.size
+    mean, m2, _, _ = _central_moments(x)
+    std = np.sqrt(m2 * n / (n - 1))
+    if std == 0:
+        return np.nan, np.nan
+    z = np.sort((x - mean) / std)
+    i = np.arange(1, n + 1)
+    a2 = -n - np.sum((2 * i - 1) * (stats.norm.logcdf(z) + stats.norm.logsf(z[::-1]))) / n
+    aa = a2 * (1 + 0.75 / n + 2.25 / n ** 2)
+    if aa >= 0.6:
+        p = np.exp(1.2937 - 5.709 * aa + 0.0186 * aa ** 2)
+    elif aa >= 0.34:
+        p = np.exp(0.9177 - 4.279 * aa - 1.38 * aa ** 2)
+    elif aa >= 0.2:
+        p = 1 - np.exp(-8.318 + 42.796 * aa - 59.938 * aa ** 2)
+    else:
+        p = 1 - np.exp(-13.436 + 101.14 * aa - 223.73 * aa ** 2)
+    return float(a2), float(min(max(p, 0.0), 1.0))
+
+
+def shapiro_subsampled(x, max_n=SHAPIRO_MAX_N, seed=NORMALITY_SEED):
+    """Shapiro-Wilk on at most `max_n` values drawn with a fixed seed (deterministic)."""
+    from scipy import stats
+    if x.size > max_n:
+        idx = np.random.default_rng(seed).choice(x.size, max_n, replace=False)
+        x = x[np.sort(idx)]
+    stat, p = stats.shapiro(x)
+    return float(stat), float(p)
+
+
+def resolve_normality_method(n, method="auto"):
+    """Picks the concrete test: Shapiro-Wilk up to SHAPIRO_MAX_N, D'Agostino K² above."""
+    if method not in NORMALITY_METHODS:
+        raise ValueError(f"Unknown normality method: {method}")
+    if method != "auto":
+        return method
+    return "shapiro" if n <= SHAPIRO_MAX_N else "dagostino"
+
+
+def normality_test(data, method="auto", alpha=0.05, seed=NORMALITY_SEED):
+    """Runs the selected normality test. Returns (is_normal, p_value, method_used)."""
+    x = np.asarray(data, dtype=np.float64)
+    x = x[~np.isnan(x)]
+    if x.size < 3:
+        return False, 0, method
+    used = resolve_normality_method(x.size, method)
+    # K² and the kurtosis transform need a handful of observations
+    if used == "dagostino" and x.size < 20:
+        used = "shapiro"
+    if used == "shapiro":
+        _, p = shapiro_subsampled(x, seed=seed)
+    elif used == "dagostino":
+        _, p = dagostino_k2(x)
+    else:
+        _, p = anderson_darling(x)
+    if np.isnan(p):
+        # Constant data: not normally distributed for routing purposes
+        return False, 0, used
+    return p > alpha, p, used
+
+
+# ==========================================
+# ALL-PAIRS CORRELATION MATRIX
+# ==========================================
+RANK_CHUNK_CELLS = 4_000_000  # (pairs x rows) re-ranked at once for ragged Spearman pairs
+SPEARMAN_TABLE_MAX_GROUPS = 32  # Columns with at most this many values use contingency tables
+SPEARMAN_TABLE_WIDTH = 2048  # One-hot columns per block when building those tables
+
+def _rank_columns(block, valid):
+    """Average ranks of each column (row of `block`), NaN where missing."""
+    from scipy import stats
+    ranks = np.full(block.shape, np.nan)
+    for j in range(block.shape[0]):
+        ranks[j, valid[j]] = stats.rankdata(block[j, valid[j]])
+    return ranks
+
+
+def _spearman_from_tables(block, valid, cols, r, ragged):
+    """Exact Spearman r for ragged pairs among low-cardinality columns (Likert items), written into `r`.
+
+    On a pair's common rows all rows sharing a value get one average rank,
+    so r depends only on the pair's contingency table. Every table comes
+    from a product of one-hot blocks (missing rows have no 1s, which gives
+    pairwise deletion for free); ranks and sums are then per table cell.
+    """
+    n_rows = block.shape[1]
+    codes = np.full((len(cols), n_rows), -1)
+    for a, i in enumerate(cols):
+        codes[a, valid[i]] = np.unique(block[i, valid[i]], return_inverse=True)[1]
+    groups = int(codes.max()) + 1
+    dtype = np.float32 if n_rows < 2 ** 24 else np.float64  # Exact integer counts either way
+
+    def one_hot(idx):
+        hot = np.zeros((n_rows, len(idx), groups), dtype=dtype)
+        for a, k in enumerate(idx):
+            rows = np.flatnonzero(codes[k] >= 0)
+            hot[rows, a, codes[k, rows]] = 1
+        return hot.reshape(n_rows, -1)
+
+    step = max(1, SPEARMAN_TABLE_WIDTH // groups)
+    chunks = [np.arange(lo, min(lo + step, len(cols))) for lo in range(0, len(cols), step)]
+    for bi, ci in enumerate(chunks):
+        hot_i = one_hot(ci)
+        for cj in chunks[bi:]:
+            sel = ragged[np.ix_(cols[ci], cols[cj])]
+            if not sel.any():
+                continue
+            tables = (hot_i.T @ one_hot(cj)).reshape(len(ci), groups, len(cj), groups)
+            tables = tables.transpose(0, 2, 1, 3).astype(np.float64)  # (i, j, value of i, value of j)
+            count_a, count_b = tables.sum(axis=3), tables.sum(axis=2)
+            m = count_a.sum(axis=2)
+            center = ((m + 1) / 2)[..., None]
+            rank_a = np.cumsum(count_a, axis=2) - (count_a - 1) / 2 - center
+            rank_b = np.cumsum(count_b, axis=2) - (count_b - 1) / 2 - center
+            cov = np.einsum("ijg,ijg->ij", rank_a, np.einsum("ijgh,ijh->ijg", tables, rank_b))
+            var_a = np.einsum("ijg,ijg->ij", count_a, rank_a * rank_a)
+            var_b = np.einsum("ijg,ijg->ij", count_b, rank_b * rank_b)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rij = np.where(m >= 2, np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0), np.nan)
+            ii = np.broadcast_to(cols[ci][:, None], sel.shape)[sel]
+            jj = np.broadcast_to(cols[cj][None, :], sel.shape)[sel]
+            r[ii, jj] = r[jj, ii] = rij[sel]
+
+
+def _restricted_ranks(keep, order, groups, starts):
+    """Centred average ranks of one column on several row subsets, in original row order (0 elsewhere).
+
+    `keep` is (subsets, rows) in the column's sorted order; `groups` and
+    `starts` describe its tie groups (None: no ties). Kept rows are counted
+    per tie group, so ranking on any subset needs no re-sort.
+    """
+    if groups is None:
+        ranks_sorted = np.cumsum(keep, axis=1, dtype=np.float32)
+        m = ranks_sorted[:, -1:]
+    else:
+        counts = np.add.reduceat(keep, starts, axis=1, dtype=np.int32)
+        ranks_sorted = (np.cumsum(counts, axis=1, dtype=np.float32) - (counts - 1) * np.float32(0.5))[:, groups]
+        m = counts.sum(axis=1, keepdims=True, dtype=np.float32)
+    ranks = np.empty(keep.shape, dtype=np.float32)
+    ranks[:, order] = (ranks_sorted - (m + 1) * np.float32(0.5)) * keep
+    return ranks
+
+
+def _spearman_from_ranks(block, valid, cols, r, ragged):
+    """Exact Spearman r for ragged pairs involving high-cardinality columns, written into `r`.
+
+    Every column is sorted once. Column blocks are paired up and each
+    column is re-ranked on its common rows with every partner in the other
+    block from counts over its own sorted order; r is then the Pearson
+    correlation of the two centred rank arrays.
+    """
+    n_rows = block.shape[1]
+    order = np.argsort(block, axis=1, kind="stable")  # NaN sorts last
+    ordered = np.take_along_axis(block, order, axis=1)
+    valid_sorted = np.take_along_axis(valid, order, axis=1)
+    ties = {}
+    for i in cols:
+        new = np.r_[True, ordered[i, 1:] != ordered[i, :-1]]
+        starts = np.flatnonzero(new)
+        ties[i] = (None if starts.size == n_rows else np.cumsum(new) - 1, starts)
+    size = max(1, int(np.sqrt(RANK_CHUNK_CELLS / max(n_rows, 1))))
+    blocks = [cols[lo:lo + size] for lo in range(0, len(cols), size)]
+    for bi, rows_i in enumerate(blocks):
+        for cols_j in blocks[bi:]:
+            sel = ragged[np.ix_(rows_i, cols_j)]
+            if not sel.any():
+                continue
+            ranks_ij = np.stack([_restricted_ranks(valid[cols_j][:, order[i]] & valid_sorted[i], order[i], *ties[i])
+                                 for i in rows_i])
+            ranks_ji = np.stack([_restricted_ranks(valid[rows_i][:, order[j]] & valid_sorted[j], order[j], *ties[j])
+                                 for j in cols_j]).transpose(1, 0, 2)
+            m = valid[rows_i].astype(np.float64) @ valid[cols_j].T.astype(np.float64)
+            sab = np.einsum("ijk,ijk->ij", ranks_ij, ranks_ji, dtype=np.float64)
+            # Without ties the centred ranks 1..m have a closed-form sum of squares
+            untied = m * (m * m - 1) / 12
+            tied_i = np.array([ties[i][0] is not None for i in rows_i])
+            tied_j = np.array([ties[j][0] is not None for j in cols_j])
+            saa = np.einsum("ijk,ijk->ij", ranks_ij, ranks_ij, dtype=np.float64) if tied_i.any() else untied
+            sbb = np.einsum("ijk,ijk->ij", ranks_ji, ranks_ji, dtype=np.float64) if tied_j.any() else untied
+            with np.errstate(invalid="ignore", divide="ignore"):
+                rij = np.where(m >= 2, np.clip(sab / np.sqrt(saa * sbb), -1.0, 1.0), np.nan)
+            ii = np.broadcast_to(rows_i[:, None], sel.shape)[sel]
+            jj = np.broadcast_to(cols_j[None, :], sel.shape)[sel]
+            r[ii, jj] = r[jj, ii] = rij[sel]
+
+
+def _ragged_spearman(block, valid, r, ragged):
+    """Exact Spearman r for pairs whose missing-value patterns differ, written into `r`.
+
+    Matches `stats.spearmanr` on each pair's common rows without a Python
+    loop over pairs: pairs of discrete columns go through contingency
+    tables, the rest through re-ranking on sorted orders.
+    """
+    n_cols = block.shape[0]
+    distinct = np.array([np.unique(block[i, valid[i]]).size for i in range(n_cols)])
+    low = distinct <= SPEARMAN_TABLE_MAX_GROUPS
+    if low.sum() >= 2:
+        _spearman_from_tables(block, valid, np.flatnonzero(low), r, ragged)
+    rest = ragged & ~(low[:, None] & low[None, :])
+    if rest.any():
+        _spearman_from_ranks(block, valid, np.flatnonzero(rest.any(axis=1)), r, rest)
+
+
+def _pairwise_pearson(block, valid):
+    """Pairwise-complete Pearson r and n for every column pair via matrix products.
+
+    With V the validity mask and X the (centred) data with missing set to 0,
+    every pairwise sum is a single product: n = V Vᵀ, Σx = X Vᵀ, Σx² = X² Vᵀ, Σxy = X Xᵀ.
+    """
+    m = valid.astype(np.float64)
+    counts = m.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Centre on each column's own mean to keep the sums well conditioned
+        shift = np.where(counts > 0, np.nansum(block, axis=1) / counts, 0.0)
+    x = np.where(valid, block - shift[:, None], 0.0)
+    n = m @ m.T
+    sx = x @ m.T                # sx[i, j] = Σ x_i over rows where j is valid
+    sxx = (x * x) @ m.T
+    sxy = x @ x.T
+    sy = sx.T
+    syy = sxx.T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = n * sxy - sx * sy
+        var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+        r = cov / np.sqrt(var)
+    r = np.clip(r, -1.0, 1.0)
+    r[n < 2] = np.nan
+    return r, n
+
+
+def _correlation_pvalues(r, n):
+    """Two-sided p-values for correlation coefficients (t-test with n-2 df, vectorized)."""
+    from scipy import stats
+    df = n - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t_stat = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t_stat), df)
+    p[np.abs(r) >= 1.0] = 0.0
+    p[(df <= 0) | np.isnan(r)] = np.nan
+    return p
+
+
+def correlation_matrix(df, columns, method="pearson"):
+    """Full Pearson or Spearman matrix for many numeric columns with pairwise NaN handling.
+
+    Returns (r, p, n) as DataFrames indexed by column name. Spearman ranks each
+    column once; pairs whose missing-value patterns differ are re-ranked on
+    their common rows (vectorised, see `_ragged_spearman`) so every entry
+    matches `stats.spearmanr` on the pair.
+    """
+    columns = list(dict.fromkeys(columns))
+    block = _as_matrix(df, columns)
+    valid = ~np.isnan(block)
+
+    if method == "pearson":
+        r, n = _pairwise_pearson(block, valid)
+    elif method == "spearman":
+        r, n = _pairwise_pearson(_rank_columns(block, valid), valid)
+        counts = valid.sum(axis=1)
+        ragged = (n < counts[:, None]) | (n < counts[None, :])
+        if ragged.any():
+            _ragged_spearman(block, valid, r, ragged)
+    else:
+        raise ValueError(f"Unknown correlation method: {method}")
+
+    np.fill_diagonal(r, np.where(np.diag(n) >= 2, 1.0, np.nan))
+    p = _correlation_pvalues(r, n)
+    wrap = lambda a: pd.DataFrame(a, index=columns, columns=columns)
+    return wrap(r), wrap(p), wrap(n.astype(int))
+
+
+# ==========================================
+# PAIRWISE ASSOCIATION TESTS (NO PLOTTING)
+# ==========================================
+PEARSON = "Pearson Correlation"
+SPEARMAN = "Spearman Rank Correlation"
+CHI_SQUARE = "Chi-Square Test"
+T_TEST = "Independent t-test (Point-Biserial)"
+ANOVA = "One-way ANOVA"
+KRUSKAL = "Kruskal-Wallis H Test"
+GROUP_METHODS = (T_TEST, ANOVA, KRUSKAL)
+
+
+def correlation_test(x, y, normality="auto"):
+    """Pearson when both variables pass the normality test, Spearman otherwise.
+
+    `x` and `y` must already be pair-complete. Returns a dict with method,
+    r, p, the two normality p-values and the normality test used.
+    """
+    from scipy import stats
+    norm_x, p_x, test_x = normality_test(x, method=normality)
+    norm_y, p_y, test_y = normality_test(y, method=normality)
+    if norm_x and norm_y:
+        method = PEARSON
+        r, p = stats.pearsonr(x, y)
+    else:
+        method = SPEARMAN
+        r, p = stats.spearmanr(x, y)
+    return {
+        "method": method,
+        "r": float(r),
+        "p": float(p),
+        "p_x": float(p_x),
+        "p_y": float(p_y),
+        "normality_test": test_x if test_x == test_y else f"{test_x} / {test_y}"
+    }
+
+
+DENSE_MAX_CELLS = 1_000_000  # Above this many (row, col) combinations cells are counted sparsely
+HEATMAP_TOP_K = 15  # Categories kept per axis in the chi-square heatmap (rest -> "Other")
+MONTE_CARLO_REPS = 2000
+MONTE_CARLO_MAX_N = 200_000  # Larger samples keep the asymptotic p-value even with sparse cells
+CHI_SQUARE_SEED = 0
+
+
+def contingency_cells(codes_x, codes_y, n_x, n_y):
+    """Non-empty cells of the contingency table from integer category codes (-1 = missing).
+
+    Both columns are combined into one code per row; counting uses
+    `np.bincount` while the n_x * n_y grid is small and `np.unique` over the
+    observed codes otherwise, so memory follows the number of non-empty
+    cells. Returns (row_codes, col_codes, counts).
+    """
+    keep = (codes_x >= 0) & (codes_y >= 0)
+    combined = codes_x[keep].astype(np.int64) * n_y + codes_y[keep]
+    if n_x * n_y <= DENSE_MAX_CELLS:
+        counts = np.bincount(combined, minlength=n_x * n_y)
+        cells = np.flatnonzero(counts)
+        counts = counts[cells]
+    else:
+        cells, counts = np.unique(combined, return_counts=True)
+    return cells // n_y, cells % n_y, counts
+
+
+def _chi_square_stat(rows, cols, counts, n_x, n_y):
+    """Pearson chi-square from the non-empty cells only: sum(O^2 / E) - N."""
+    row_tot = np.bincount(rows, counts, minlength=n_x)
+    col_tot = np.bincount(cols, counts, minlength=n_y)
+    n = counts.sum()
+    expected = row_tot[rows] * col_tot[cols] / n
+    return float((counts * counts / expected).sum() - n), row_tot, col_tot
+
+
+def _low_expected_share(row_tot, col_tot, n):
+    """Share of cells with expected count < 5, and the smallest expected count."""
+    r = row_tot[row_tot > 0]
+    c = np.sort(col_tot[col_tot > 0])
+    below = np.searchsorted(c, 5 * n / r, side="left").sum()
+    return below / (r.size * c.size), r.min() * c[0] / n
+
+
+def chi_square_test(table):
+    """Chi-square test of independence on a contingency table. Returns (stat, p, dof)."""
+    from scipy import stats
+    stat, p, dof, _ = stats.chi2_contingency(table)
+    return float(stat), float(p), int(dof)
+
+
+def chi_square_from_codes(codes_x, codes_y, n_x, n_y, reps=MONTE_CARLO_REPS, seed=CHI_SQUARE_SEED):
+    """Chi-square test and Cramer's V on factorized columns without a dense table.
+
+    The p-value is asymptotic unless expected counts are small (any < 1 or
+    more than 20% < 5): then 2x2 tables use Fisher's exact test and larger
+    ones a Monte-Carlo permutation test (up to MONTE_CARLO_MAX_N rows).
+    2x2 tables report SciPy's Yates-corrected statistic and p-value, while
+    Cramer's V keeps its standard definition on the uncorrected Pearson
+    chi-square. Returns
+    (result dict, (row_codes, col_codes, counts)).
+    """
+    from scipy import stats
+    cells = contingency_cells(codes_x, codes_y, n_x, n_y)
+    rows, cols, counts = cells
+    stat, row_tot, col_tot = _chi_square_stat(rows, cols, counts, n_x, n_y)
+    n = int(counts.sum())
+    n_rows, n_cols = int((row_tot > 0).sum()), int((col_tot > 0).sum())
+    dof = (n_rows - 1) * (n_cols - 1)
+    cramers_v = np.sqrt(stat / (n * (min(n_rows, n_cols) - 1))) if min(n_rows, n_cols) > 1 else np.nan
+    low_share, min_expected = _low_expected_share(row_tot, col_tot, n)
+
+    if dof == 1:
+        table = np.zeros((2, 2), dtype=np.int64)
+        np.add.at(table, (np.unique(rows, return_inverse=True)[1], np.unique(cols, return_inverse=True)[1]), counts)
+        stat, p, _ = chi_square_test(table)
+    else:
+        p = float(stats.chi2.sf(stat, dof)) if dof > 0 else 1.0
+    p_method = "asymptotic"
+
+    if dof > 0 and (min_expected < 1 or low_share > 0.2):
+        if dof == 1:
+            p, p_method = float(stats.fisher_exact(table)[1]), "fisher exact"
+        elif n <= MONTE_CARLO_MAX_N:
+            from permutation import permutation_chi_square
+            p, _ = permutation_chi_square(codes_x, codes_y, max_perms=reps, seed=seed)
+            p_method = "monte carlo"
+
+    result = {
+        "chi2": float(stat), "p": float(p), "dof": int(dof), "cramers_v": float(cramers_v),
+        "p_method": p_method, "low_expected": float(low_share),
+    }
+    return result, cells
+
+
+def top_k_table(cells, labels_x, labels_y, k=HEATMAP_TOP_K):
+    """Dense table of the k most frequent categories per axis, the rest summed into "Other"."""
+    rows, cols, counts = cells
+
+    def axis(codes, n):
+        totals = np.bincount(codes, counts, minlength=n)
+        present = np.flatnonzero(totals)
+        top = present if present.size <= k else np.sort(present[np.argsort(-totals[present], kind="stable")[:k]])
+        position = np.full(n, top.size)
+        position[top] = np.arange(top.size)
+        return top, position, present.size > top.size
+
+    top_r, pos_r, other_r = axis(rows, len(labels_x))
+    top_c, pos_c, other_c = axis(cols, len(labels_y))
+    table = np.zeros((top_r.size + other_r, top_c.size + other_c), dtype=np.int64)
+    np.add.at(table, (pos_r[rows], pos_c[cols]), counts)
+    index = [str(v) for v in np.asarray(labels_x)[top_r]] + (["Other"] if other_r else [])
+    columns = [str(v) for v in np.asarray(labels_y)[top_c]] + (["Other"] if other_c else [])
+    return pd.DataFrame(table, index=pd.Index(index), columns=pd.Index(columns))
+
+
+def categorical_contingency(x, y, k=HEATMAP_TOP_K):
+    """Top-k contingency table of two pair-complete categorical Series (for the heatmap)."""
+    codes_x, labels_x = pd.factorize(x, sort=True)
+    codes_y, labels_y = pd.factorize(y, sort=True)
+    table = top_k_table(contingency_cells(codes_x, codes_y, len(labels_x), len(labels_y)), labels_x, labels_y, k)
+    table.index.name, table.columns.name = x.name, y.name
+    return table
+
+
+def _group_moments(values, codes, n_groups):
+    """Per-group counts, sums and sums of squares in one bincount pass (values centered first)."""
+    centered = values - values.mean()
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, centered, minlength=n_groups)
+    sumsq = np.bincount(codes, centered * centered, minlength=n_groups)
+    return counts, sums, sumsq
+
+
+def kruskal_from_codes(values, codes, n_groups):
+    """Kruskal-Wallis H (tie-corrected) with one global ranking and per-group rank sums."""
+    from scipy import stats
+    n = values.size
+    ranks = stats.rankdata(values)
+    counts = np.bincount(codes, minlength=n_groups)
+    rank_sums = np.bincount(codes, ranks, minlength=n_groups)
+    present = counts > 0
+    h = 12.0 / (n * (n + 1)) * (rank_sums[present] ** 2 / counts[present]).sum() - 3 * (n + 1)
+    ties = np.unique(values, return_counts=True)[1].astype(np.float64)
+    correction = 1 - (ties ** 3 - ties).sum() / (n ** 3 - n)
+    h = h / correction if correction > 0 else np.nan
+    k = int(present.sum())
+    return float(h), float(stats.chi2.sf(h, k - 1))
+
+
+def group_test(values, codes, n_groups, normality="auto"):
+    """Numeric x categorical test from per-group sufficient statistics.
+
+    `values` is float64 and `codes` the group codes (both pair-complete).
+    When the within-group residuals pass the normality test (the same
+    routing as Pearson/Spearman), two groups use the pooled t-test
+    (reported with the point-biserial r) and more groups a one-way ANOVA;
+    otherwise Kruskal-Wallis. Eta squared is SS_between / SS_total, or
+    (H - k + 1) / (n - k) for Kruskal-Wallis. Cost is linear in rows and
+    groups.
+    """
+    from scipy import stats
+    counts, sums, sumsq = _group_moments(values, codes, n_groups)
+    present = counts > 0
+    k, n = int(present.sum()), values.size
+    if k < 2 or n <= k:
+        return {"method": "Error", "error": "Need at least two groups with more observations than groups."}
+    counts, sums, sumsq = counts[present], sums[present], sumsq[present]
+    means = sums / counts
+    ss_between = (sums * means).sum() - sums.sum() ** 2 / n
+    ss_within = sumsq.sum() - (sums * means).sum()
+    ss_total = ss_between + ss_within
+
+    residuals = values - means[(np.cumsum(present) - 1)[codes]]
+    is_normal, p_norm, used = normality_test(residuals, method=normality)
+    summary = {"groups": k, "p_norm": float(p_norm), "normality_test": used}
+    if is_normal:
+        if k == 2:
+            pooled = ss_within / (n - 2)
+            t = (means[1] - means[0]) / np.sqrt(pooled * (1 / counts[0] + 1 / counts[1]))
+            p = 2 * stats.t.sf(abs(t), n - 2)
+            summary.update(method=T_TEST, stat=float(t), p=float(p), r_pb=float(t / np.sqrt(t * t + n - 2)))
+        else:
+            f = (ss_between / (k - 1)) / (ss_within / (n - k))
+            summary.update(method=ANOVA, stat=float(f), p=float(stats.f.sf(f, k - 1, n - k)))
+        summary["eta2"] = float(ss_between / ss_total) if ss_total > 0 else np.nan
+    else:
+        h, p = kruskal_from_codes(values, codes, n_groups)
+        summary.update(method=KRUSKAL, stat=h, p=p, eta2=float(max(h - k + 1, 0) / (n - k)))
+    return summary
+
+
+# ==========================================
+# ANALYSIS HELPERS (SHARED BY THE APP AND THE CLI)
+# ==========================================
+def get_descriptive_stats(df, column):
+    """Calculates descriptive stats for a numerical column (or a list of columns)."""
+    if isinstance(column, (list, tuple)):
+        return describe_columns(df, column)
+    return describe_columns(df, [column])[column]
+
+# Normality engine choices shown in the UI -> normality_test method names
+NORMALITY_OPTIONS = {
+    "Auto": "auto",
+    "Shapiro-Wilk": "shapiro",
+    "D'Agostino K²": "dagostino",
+    "Anderson-Darling": "anderson"
+}
+
+def check_normality(data, method="auto"):
+    """Performs a normality test (Shapiro-Wilk for small N, D'Agostino K² above 5000 by default).
+    Returns True if Normal, False otherwise, plus the p-value."""
+    is_normal, p_value, _ = normality_test(data, method=method)
+    return is_normal, p_value
+
+def interpret_correlation(r, p):
+    """Returns text interpretation of correlation r and p-value."""
+    strength = ""
+    abs_r = abs(r)
+    if abs_r < 0.3: strength = "Weak/Lemah"
+    elif abs_r < 0.7: strength = "Moderate/Sedang"
+    else: strength = "Strong/Kuat"
+    
+    direction = "Positive (+)" if r > 0 else "Negative (-)"
+    significance = "Significant/Signifikan (p<0.05)" if p < 0.05 else "Not Significant/Tidak Signifikan"
+    
+    return strength, direction, significance
+
+def association_summary(df, col_x, col_y, normality="auto", bootstrap=False, permutation=False):
+    """Selects the method for (col_x, col_y) and returns raw (unformatted) results.
+
+    Chi-Square results carry the contingency table under "contingency". With
+    `bootstrap`, correlations also get a 95% percentile CI for r
+    ("r_ci_low" / "r_ci_high"). With `permutation`, correlations and
+    Chi-Square also get a permutation p-value ("p_perm", "n_perm").
+    """
+    clean_df = df[[col_x, col_y]].dropna()
+    x = clean_df[col_x]
+    y = clean_df[col_y]
+    if len(x) == 0:
+        return {"method": "Error", "n": 0, "error": "No valid data"}
+
+    is_x_numeric = pd.api.types.is_numeric_dtype(x)
+    is_y_numeric = pd.api.types.is_numeric_dtype(y)
+
+    if is_x_numeric and is_y_numeric:
+        summary = correlation_test(x, y, normality=normality)
+        if bootstrap:
+            from bootstrap import bootstrap_ci
+            statistic = "pearson" if summary["method"] == PEARSON else "spearman"
+            _, summary["r_ci_low"], summary["r_ci_high"] = bootstrap_ci(statistic, x, y)
+        if permutation:
+            from permutation import permutation_correlation
+            method = "pearson" if summary["method"] == PEARSON else "spearman"
+            summary["p_perm"], summary["n_perm"] = permutation_correlation(x, y, method=method)
+    elif not is_x_numeric and not is_y_numeric:
+        # Factorize once and count only non-empty cells (postcodes, product IDs, ...)
+        codes_x, labels_x = pd.factorize(x, sort=True)
+        codes_y, labels_y = pd.factorize(y, sort=True)
+        result, cells = chi_square_from_codes(codes_x, codes_y, len(labels_x), len(labels_y))
+        contingency = top_k_table(cells, labels_x, labels_y)
+        contingency.index.name, contingency.columns.name = col_x, col_y
+        summary = {"method": CHI_SQUARE, **result, "contingency": contingency}
+        if permutation:
+            from permutation import permutation_chi_square
+            summary["p_perm"], summary["n_perm"] = permutation_chi_square(codes_x, codes_y)
+    else:
+        values, groups = (x, y) if is_x_numeric else (y, x)
+        codes, labels = pd.factorize(groups, sort=True)
+        summary = group_test(values.to_numpy(dtype=np.float64), codes, len(labels), normality=normality)
+    summary["n"] = len(x)
+    return summary
+
+def format_association(summary):
+    """Display rows for an association_summary result. Returns (method, {label: text})."""
+    method = summary["method"]
+    if method in (PEARSON, SPEARMAN):
+        r, p = summary["r"], summary["p"]
+        strength, direction, sig = interpret_correlation(r, p)
+        res = {
+            "Coefficient (r)": f"{r:.4f}",
+            "p-value": f"{p:.4f}",
+            "Normality X (p)": f"{summary['p_x']:.4f}",
+            "Normality Y (p)": f"{summary['p_y']:.4f}",
+            "Normality Test": summary["normality_test"],
+            "Interpretation": f"{strength}, {direction}, {sig}"
+        }
+        if "r_ci_low" in summary:
+            res["r 95% CI (Bootstrap)"] = f"[{summary['r_ci_low']:.4f}, {summary['r_ci_high']:.4f}]"
+    elif method == CHI_SQUARE:
+        p = summary["p"]
+        res = {
+            "Chi2 Stat": f"{summary['chi2']:.4f}",
+            "p-value": f"{p:.4f}",
+            "p-value Method": summary["p_method"],
+            "Cramér's V": f"{summary['cramers_v']:.4f}",
+            "Result": "Significant" if p < 0.05 else "Not Significant"
+        }
+    elif method in GROUP_METHODS:
+        p = summary["p"]
+        res = {
+            "Statistic (t/F/H)": f"{summary['stat']:.4f}",
+            "p-value": f"{p:.4f}",
+            "Effect Size (η²)": f"{summary['eta2']:.4f}",
+        }
+        if method == T_TEST:
+            res["Point-Biserial r"] = f"{summary['r_pb']:.4f}"
+        res.update({
+            "Groups": summary["groups"],
+            "Normality Residuals (p)": f"{summary['p_norm']:.4f}",
+            "Normality Test": summary["normality_test"],
+            "Result": "Significant" if p < 0.05 else "Not Significant"
+        })
+    else:
+        return method, {"Error": summary["error"]}
+
+    if "p_perm" in summary:
+        res["Permutation p-value"] = f"{summary['p_perm']:.4f} ({summary['n_perm']} permutations)"
+    return method, res
+
+
+def analyze_association_logic(df, col_x, col_y, normality="auto", with_plot=True, bootstrap=False,
+                              permutation=False):
+    """Automatically selects method and computes stats.
+    With with_plot=False no figure is built (see stats_plots.build_association_figure)."""
+    summary = association_summary(df, col_x, col_y, normality=normality, bootstrap=bootstrap,
+                                  permutation=permutation)
+    method, res = format_association(summary)
+    fig = None
+    if with_plot and "Error" not in res:
+        from stats_plots import build_association_figure
+        pair = df[[col_x, col_y]].dropna()
+        fig = build_association_figure(pair[col_x], pair[col_y], col_x, col_y, method,
+                                       summary.get("contingency"))
+    return method, res, fig
@@ -0,0 +1,79 @@
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from plot_large import LARGE_N, draw_binned_histogram, draw_density_scatter
+from stats_engine import PEARSON, CHI_SQUARE, GROUP_METHODS, HEATMAP_TOP_K, categorical_contingency
+
+# ==========================================
+# CHART BUILDERS
+# ==========================================
+# Set Seaborn Style (Earth Tone Palette for Charts)
+sns.set_theme(style="whitegrid")
+EARTH_PALETTE = sns.color_palette("BrBG", 10) # Brown-Blue-Green Earthy tones
+
+# Each builder returns a new Figure; callers rasterize and close it (plot_cache).
+
+def build_histogram(series, col):
+    fig, ax = plt.subplots(figsize=(6,4))
+    if series.count() > LARGE_N:
+        # Large data: pre-binned counts + KDE on a binned grid instead of per-row evaluation
+        draw_binned_histogram(ax, series.dropna(), color='#8c564b')
+        ax.set_xlabel(col)
+    else:
+        sns.histplot(series, kde=True, ax=ax, color='#8c564b') # Brown
+    ax.set_title(f"Histogram: {col}")
+    return fig
+
+def build_boxplot(series, col):
+    fig, ax = plt.subplots(figsize=(6,4))
+    sns.boxplot(x=series, ax=ax, color='#d9c0a3') # Beige
+    ax.set_title(f"Boxplot: {col}")
+    return fig
+
+def build_frequency_plot(freq, col):
+    fig, ax = plt.subplots(figsize=(6,4))
+    sns.barplot(data=freq, x='Category', y='Frequency', ax=ax, palette="BrBG")
+    ax.set_title(f"Frequency: {col}")
+    return fig
+
+def build_association_figure(x, y, col_x, col_y, method, contingency=None):
+    """Scatterplot for correlations, heatmap for Chi-Square (pair-complete x, y)."""
+    fig, ax = plt.subplots(figsize=(6, 4))
+    if method == CHI_SQUARE:
+        # Heatmap with Earth Tones (top categories only, the rest aggregated into "Other")
+        if contingency is None: contingency = categorical_contingency(x, y)
+        sns.heatmap(contingency, annot=True, fmt='d', cmap="BrBG", ax=ax, linewidths=1)
+        ax.set_title(f"Heatmap: {col_x} vs {col_y}")
+    elif method in GROUP_METHODS:
+        # Boxplot of the numeric variable by group (largest groups only)
+        values, groups = (x, y) if pd.api.types.is_numeric_dtype(x) else (y, x)
+        top = groups.value_counts().index[:HEATMAP_TOP_K]
+        keep = groups.isin(top)
+        sns.boxplot(x=groups[keep].astype(str), y=values[keep], order=[str(g) for g in top],
+                    ax=ax, color='#d9c0a3') # Beige
+        ax.tick_params(axis='x', labelrotation=45)
+        ax.set_title(f"Boxplot: {values.name} by {groups.name}")
+    else:
+        if len(x) > LARGE_N:
+            # Large data: hexbin density instead of one marker per row
+            draw_density_scatter(ax, x, y, fit_line=(method == PEARSON))
+            ax.set_xlabel(col_x); ax.set_ylabel(col_y)
+            ax.set_title(f"Density: {col_x} vs {col_y}")
+        else:
+            # Scatterplot with Earth Tones
+            sns.scatterplot(x=x, y=y, ax=ax, color='#8c564b', s=80, alpha=0.8) # Chestnut Brown
+            if method == PEARSON:
+                sns.regplot(x=x, y=y, ax=ax, scatter=False, color='#556B2F') # Olive Green
+            ax.set_title(f"Scatterplot: {col_x} vs {col_y}")
+    plt.tight_layout()
+    return fig
+
+def plot_correlation_clustermap(r, title):
+    """Clustered heatmap of a correlation matrix (annotated only when small)."""
+    size = min(4 + 0.25 * len(r), 30)
+    filled = r.fillna(0)
+    grid = sns.clustermap(filled, cmap="BrBG", vmin=-1, vmax=1, center=0,
+                          annot=len(r) <= 12, fmt=".2f", figsize=(size, size))
+    grid.fig.suptitle(title)
+    return grid.fig
@@ -0,0 +1,162 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# ==========================================
+# STREAMING (ONE-PASS) DESCRIPTIVE STATISTICS
+# ==========================================
+DEFAULT_CHUNKSIZE = 200_000
+MAX_MODE_CARDINALITY = 10_000  # Stop exact mode tracking above this many distinct values
+
+
+class KLLSketch:
+    """KLL quantile sketch: bounded-memory approximate quantiles over a stream.
+
+    Items live in compactors of increasing weight (2**level). When a level
+    overflows it is sorted and every other item is promoted, so memory stays
+    O(k log(n/k)) while rank error stays around 1/k.
+    """
+
+    def __init__(self, k=200, c=2.0 / 3.0, seed=0):
+        self.k = k
+        self.c = c
+        self.n = 0
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * self.c ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        self.n += values.size
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Odd leftovers stay on this level so no weight is lost
+                keep = items[:1] if items.size % 2 else items[:0]
+                pairs = items[keep.size:]
+                offset = int(self._rng.integers(2))
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], pairs[offset::2]])
+                self._levels[level] = keep
+            level += 1
+
+    def quantile(self, q):
+        if self.n == 0:
+            return np.nan
+        items = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(lv.size, 2.0 ** i) for i, lv in enumerate(self._levels)])
+        order = np.argsort(items, kind="stable")
+        items, cum = items[order], np.cumsum(weights[order])
+        idx = np.searchsorted(cum, q * cum[-1], side="left")
+        return float(items[min(idx, items.size - 1)])
+
+
+class ColumnAccumulator:
+    """Per-column one-pass accumulator: Welford moments, min/max, KLL median, mode."""
+
+    def __init__(self, sketch_k=200, seed=0):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.sketch = KLLSketch(k=sketch_k, seed=seed)
+        self.counts = {}  # value -> frequency (dropped once cardinality is too high)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        n_b = values.size
+        if n_b == 0:
+            return
+        # Chan et al. parallel form of Welford: merge chunk moments into the running ones
+        mean_b = values.mean()
+        m2_b = float(((values - mean_b) ** 2).sum())
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.count * n_b / n
+        self.count = n
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.sketch.update(values)
+        if self.counts is not None:
+            uniq, freq = np.unique(values, return_counts=True)
+            for v, f in zip(uniq.tolist(), freq.tolist()):
+                self.counts[v] = self.counts.get(v, 0) + f
+            if len(self.counts) > MAX_MODE_CARDINALITY:
+                self.counts = None
+
+    def result(self):
+        """Returns the same keys as get_descriptive_stats."""
+        if self.count == 0:
+            return {k: np.nan for k in ("Mean", "Median", "Mode", "Min", "Max", "Std")}
+        mode = np.nan
+        if self.counts:
+            # Ties resolve to the smallest value, like Series.mode()[0]
+            top = max(self.counts.values())
+            mode = min(v for v, f in self.counts.items() if f == top)
+        std = math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        return {
+            "Mean": self.mean,
+            "Median": self.sketch.quantile(0.5),
+            "Mode": mode,
+            "Min": self.min,
+            "Max": self.max,
+            "Std": std
+        }
+
+
+def stream_descriptive_stats(source, columns=None, chunksize=DEFAULT_CHUNKSIZE, **read_kwargs):
+    """Reads a CSV in chunks and returns ({numeric_col: stats}, {categorical_col: value_counts}).
+
+    The full dataset is never materialised: numeric columns feed a
+    ColumnAccumulator, other columns a running frequency table. A column
+    whose type changes between chunks (numbers first, text later or the
+    reverse) is recounted from its raw text in a second pass over just those
+    columns, so `source` must be a path or a seekable buffer.
+    """
+    numeric = {}
+    categorical = {}
+    mixed = []  # Columns parsed as numbers in some chunks and as text in others
+    reader = pd.read_csv(source, chunksize=chunksize, usecols=columns, **read_kwargs)
+    for chunk in reader:
+        for col in chunk.columns:
+            if col in mixed:
+                continue
+            series = chunk[col]
+            is_numeric = pd.api.types.is_numeric_dtype(series)
+            if (col in numeric and not is_numeric) or (col in categorical and is_numeric and series.notna().any()):
+                # Earlier counts are keyed by parsed values (1.0 vs "1") and may have been dropped
+                numeric.pop(col, None)
+                categorical.pop(col, None)
+                mixed.append(col)
+            elif is_numeric and col not in categorical:
+                numeric.setdefault(col, ColumnAccumulator()).update(series.to_numpy(dtype=np.float64, na_value=np.nan))
+            else:
+                counts = series.value_counts()
+                categorical[col] = counts if col not in categorical else categorical[col].add(counts, fill_value=0)
+    if mixed:
+        if hasattr(source, "seek"):
+            source.seek(0)
+        read_kwargs.pop("dtype", None)
+        for chunk in pd.read_csv(source, chunksize=chunksize, usecols=mixed, dtype=str, **read_kwargs):
+            for col in mixed:
+                counts = chunk[col].value_counts()
+                categorical[col] = counts if col not in categorical else categorical[col].add(counts, fill_value=0)
+    stats_by_col = {col: acc.result() for col, acc in numeric.items()}
+    freq_by_col = {col: counts.sort_values(ascending=False).astype(int) for col, counts in categorical.items()}
+    return stats_by_col, freq_by_col
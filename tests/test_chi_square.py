@@ -0,0 +1,19 @@
+import numpy as np
+from scipy import stats
+from scipy.stats.contingency import association
+
+from stats_engine import chi_square_from_codes
+
+
+def test_two_by_two_reports_yates_statistic_and_standard_cramers_v():
+    rng = np.random.default_rng(1)
+    codes_x = rng.integers(0, 2, 400)
+    codes_y = (codes_x + (rng.random(400) < 0.45)) % 2
+    table = np.zeros((2, 2), dtype=np.int64)
+    np.add.at(table, (codes_x, codes_y), 1)
+
+    result, _ = chi_square_from_codes(codes_x, codes_y, 2, 2)
+    stat, p, _, _ = stats.chi2_contingency(table)
+    assert np.isclose(result["chi2"], stat)
+    assert np.isclose(result["p"], p)
+    assert np.isclose(result["cramers_v"], association(table, method="cramer"))
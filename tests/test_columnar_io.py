@@ -0,0 +1,25 @@
+import io
+
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.ipc as ipc  # noqa: E402
+
+from columnar_io import read_schema, read_upload  # noqa: E402
+
+
+@pytest.mark.parametrize("writer", [ipc.new_file, ipc.new_stream], ids=["file", "stream"])
+def test_arrow_schema_and_data_for_both_ipc_formats(writer):
+    df = pd.DataFrame({"score": range(10), "group": list("abcdefghij")})
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    with writer(sink, table.schema) as out:
+        out.write_table(table, max_chunksize=4)
+    data = sink.getvalue()
+
+    schema = read_schema("upload.arrow", data)
+    assert schema.columns == ["score", "group"]
+    assert schema.numeric_columns == ["score"]
+    assert schema.n_rows == 10
+    assert read_upload("upload.arrow", data, columns=["score"])["score"].tolist() == list(range(10))
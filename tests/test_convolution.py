@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+
+from convolution import convolve, fft_filter, plan_convolution  # noqa: E402
+
+
+def _image(channels=3):
+    rng = np.random.default_rng(0)
+    ramp = np.add.outer(np.arange(150), np.arange(170)) % 256
+    image = np.clip(ramp[:, :, None] + rng.integers(-20, 21, (150, 170, channels)), 0, 255)
+    return image.astype(np.uint8)
+
+
+@pytest.mark.parametrize("shape", [(62, 62), (62, 61), (64, 70)])
+def test_fft_filter_matches_filter2d_for_even_kernels(shape):
+    kernel = np.random.default_rng(1).random(shape).astype(np.float32)
+    kernel /= kernel.sum()
+    image = _image()
+    diff = np.abs(fft_filter(image, kernel).astype(int) - cv2.filter2D(image, -1, kernel).astype(int))
+    assert diff.max() <= 1
+
+
+@pytest.mark.parametrize("kernel", [
+    np.full((4, 4), 1 / 16, np.float32),  # box
+    np.outer([1, 3, 3, 1], [1, 2, 1, 0]).astype(np.float32) / 32,  # separable
+    np.random.default_rng(2).random((64, 64)).astype(np.float32) / 2048,  # fft
+], ids=["box", "separable", "fft"])
+def test_convolve_matches_filter2d_for_even_kernels(kernel):
+    image = _image()
+    diff = np.abs(convolve(image, kernel, plan_convolution(kernel)).astype(int)
+                  - cv2.filter2D(image, -1, kernel).astype(int))
+    assert diff.max() <= 1
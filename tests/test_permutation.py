@@ -0,0 +1,27 @@
+import numpy as np
+
+from permutation import permutation_chi_square, permutation_correlation
+
+
+def test_constant_column_has_no_permutation_p_value():
+    x = np.arange(50, dtype=float)
+    p, used = permutation_correlation(x, np.full(50, 3.0))
+    assert np.isnan(p) and used == 0
+    p, used = permutation_correlation(np.ones(50), x, method="spearman")
+    assert np.isnan(p) and used == 0
+
+
+def test_single_row_table_has_no_permutation_p_value():
+    codes_x = np.zeros(40, dtype=np.int64)
+    codes_y = np.arange(40) % 4
+    p, used = permutation_chi_square(codes_x, codes_y)
+    assert np.isnan(p) and used == 0
+    p, used = permutation_chi_square(codes_y, codes_x)
+    assert np.isnan(p) and used == 0
+
+
+def test_p_value_is_reproducible():
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=300)
+    y = 0.1 * x + rng.normal(size=300)
+    assert permutation_correlation(x, y) == permutation_correlation(x, y, memory_bytes=10_000, max_workers=2)
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from reliability import reliability_analysis
+
+
+def test_float_items_without_missing_values():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(500, 1))
+    df = pd.DataFrame(base + rng.normal(scale=0.5, size=(500, 4)), columns=["q1", "q2", "q3", "q4"])
+    summary, table = reliability_analysis(df, list(df.columns), chunk_rows=128)
+
+    cov = df.cov().to_numpy()
+    k = cov.shape[0]
+    expected = k / (k - 1) * (1 - np.trace(cov) / cov.sum())
+    assert summary["N"] == 500
+    assert np.isclose(summary["Cronbach's Alpha"], expected)
+    assert np.allclose(table["Mean"], df.mean())
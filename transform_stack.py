@@ -0,0 +1,96 @@
+from collections import namedtuple
+
+import numpy as np
+
+from convolution import gaussian_kernel, plan_convolution, plan_cost
+from image_preview import level_scale, matrix_for_level, box_size_for_level
+
+# ==========================================
+# TRANSFORM CHAINS (FOLDED WARPS, FUSED KERNELS)
+# ==========================================
+# kind: "warp" (3x3 matrix in full-resolution pixels) or "filter" (2D kernel)
+# blur: ("box", size) or ("gaussian", sigma), rebuilt for the preview level; None = apply as-is
+TransformStep = namedtuple("TransformStep", ["kind", "array", "label", "blur"])
+
+
+def warp_step(matrix, label):
+    return TransformStep("warp", np.asarray(matrix, dtype=np.float64), label, None)
+
+
+def filter_step(kernel, label, blur=None):
+    return TransformStep("filter", np.asarray(kernel, dtype=np.float32), label, blur)
+
+
+def fuse_kernels(first, second):
+    """Kernel equivalent to filtering with `first` and then `second` (filter2D correlates).
+
+    Correlating twice equals correlating once with the full 2D convolution
+    of the two kernels, of size (h1 + h2 - 1, w1 + w2 - 1).
+    """
+    h1, w1 = first.shape
+    h2, w2 = second.shape
+    fused = np.zeros((h1 + h2 - 1, w1 + w2 - 1), dtype=np.float64)
+    for i in range(h2):
+        for j in range(w2):
+            fused[i:i + h1, j:j + w1] += second[i, j] * first
+    return fused.astype(np.float32)
+
+
+def stays_in_range(kernel):
+    """True when filtering cannot leave the pixel range (non-negative weights summing to <= 1).
+
+    Only then can the next kernel be fused without changing the result,
+    because the separate passes would clip the intermediate image.
+    """
+    return bool((kernel >= 0).all() and kernel.sum() <= 1 + 1e-6)
+
+
+def step_kernel(step, scale=1.0):
+    """The step's kernel on a pyramid level (blurs keep their physical radius)."""
+    if step.blur is None or scale == 1.0:
+        return step.array
+    shape, size = step.blur
+    if shape == "gaussian":
+        return gaussian_kernel(size * scale)
+    k = box_size_for_level(size, scale)
+    return np.ones((k, k), np.float32) / (k * k)
+
+
+def worth_fusing(first, second):
+    """Fusing is exact only while `first` cannot clip, and only pays off when the fused
+    kernel is no more expensive than the two passes (a box blur and a 3x3 sharpen stay apart)."""
+    if not stays_in_range(first):
+        return False
+    fused_cost = plan_cost(plan_convolution(fuse_kernels(first, second)))
+    return fused_cost <= plan_cost(plan_convolution(first)) + plan_cost(plan_convolution(second))
+
+
+def compile_stack(steps, full_shape, level_shape=None):
+    """Turns an ordered chain of steps into the minimal list of passes for one image level.
+
+    Consecutive warps are multiplied into one 3x3 matrix (one resampling,
+    whatever the chain length) and consecutive filters are fused while the
+    earlier kernel cannot clip and the fused kernel is cheaper. Returns [("warp", matrix) | ("filter", kernel)]
+    expressed in the level's pixels.
+    """
+    level_shape = level_shape or full_shape
+    scale, _ = level_scale(full_shape, level_shape)
+    program = []
+    for step in steps:
+        if step.kind == "warp":
+            if program and program[-1][0] == "warp":
+                program[-1] = ("warp", step.array @ program[-1][1])
+            else:
+                program.append(("warp", step.array))
+        else:
+            kernel = step_kernel(step, scale)
+            if kernel.shape == (1, 1) and kernel[0, 0] == 1:
+                continue  # Blur smaller than one preview pixel
+            if program and program[-1][0] == "filter" and worth_fusing(program[-1][1], kernel):
+                program[-1] = ("filter", fuse_kernels(program[-1][1], kernel))
+            else:
+                program.append(("filter", kernel))
+    return [
+        (kind, matrix_for_level(array, full_shape, level_shape) if kind == "warp" else array)
+        for kind, array in program
+    ]